@@ -1,7 +1,10 @@
-from langchain_groq import ChatGroq
 from typing_extensions import TypedDict
-import os
-from Tasks import ProblemType,EDAReport,EDAStrategy
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from llm_backends import LLM_BACKEND, make_chat_model
+from llm_cache import LLM_CACHE_ENABLED, CachedLLM
+from prompt_compaction import PROMPT_BUDGETS, compact_profile, prompt_stats, schema_summary
+from Tasks import ProblemType,EDAPlan,EDAReport,EDAStrategy
 
 class State(TypedDict):
     Domain_expert: dict
@@ -12,19 +15,16 @@ class State(TypedDict):
 
 class EDA_Agents:
     def __init__(self):
-         self.llm = ChatGroq(
-            api_key=os.getenv("GROQ_API_KEY"),
-            model="llama-3.1-8b-instant"
-        )
+         # Recording and replay must see every call, so the response cache only fronts the live API.
+         self.llm = CachedLLM(make_chat_model(), enabled=LLM_CACHE_ENABLED and LLM_BACKEND == "groq")
 
     def Domain_expert(self,state: State, df, columns) -> dict:
-        result = self.llm.with_structured_output(ProblemType).invoke(
-            f"""You are a Domain expert, you have to analyze the dataset and column names
+        prompt = f"""You are a Domain expert, you have to analyze the dataset and column names
     and identify the type of problem we are trying to solve ("regression", "classification", "clustering", "unknown"),
     what is the target variable if not a clustering problem, and provide the confidence scores for each problem type.
 
-    dataset_sample:{df.to_dict()}
-    dataset_columns:{columns}
+    dataset_schema (column (dtype); example values; stats over a {len(df)}-row sample):
+{schema_summary(df, columns, PROMPT_BUDGETS["Domain_expert"])}
 
     Respond with a JSON object with the following fields:
     - problem_type: one of "regression", "classification", "clustering"
@@ -33,7 +33,8 @@ class EDA_Agents:
     - confidence_score_classification: confidence as a float between 0 and 1
     - confidence_score_clustering: confidence as a float between 0 and 1
     """
-        )
+        prompt_stats.record("Domain_expert", prompt)
+        result = self.llm.with_structured_output(ProblemType).invoke(prompt)
         return {
             "Domain_expert": result.model_dump()
             if hasattr(result, "model_dump")
@@ -41,14 +42,16 @@ class EDA_Agents:
         }
 
     def Dataset_profiling(self,state: State) -> dict:
-        return {
-            "EDA_report_generator": self.llm.invoke(f"""
+        prompt = f"""
     Your are Dataset Profiler, you have to generate a detailed dataset profiling report based on the following basic EDA analysis:
-                        Basic_EDA_analysis:{state["Dataset_profiler"]}""").content
+                        Basic_EDA_analysis:{compact_profile(state["Dataset_profiler"], PROMPT_BUDGETS["Dataset_profiling"])}"""
+        prompt_stats.record("Dataset_profiling", prompt)
+        return {
+            "EDA_report_generator": self.llm.invoke(prompt).content
         }
 
     def EDA_Strategy_Generator(self,state: State) -> dict:
-        result = self.llm.with_structured_output(EDAStrategy).invoke(f"""
+        prompt = f"""
         You are an EDA specialist, you have to genrate an EDA strategy based on the following domain expertise.
         Report: It should be a detailed plan outlining the EDA approach.
         focus_areas: List of key areas to focus on during EDA,should be amoung (descriptive_analysis, correlation_analysis, outlier_detection,feature_ranking).
@@ -57,14 +60,45 @@ class EDA_Agents:
         analysis_to_skip: List of analyses that are not necessary and takes lots of computation.
         priority_order: List of priorities for the analyses.
                                         
-        Domain_expertise:{state["Domain_expert"]}""")
+        Domain_expertise:{state["Domain_expert"]}"""
+        prompt_stats.record("EDA_Strategy_Generator", prompt)
+        result = self.llm.with_structured_output(EDAStrategy).invoke(prompt)
         return {
             "EDA_Resonner": result.model_dump() if hasattr(result, "model_dump") else result
         }
+
+    def EDA_Plan(self,state: State, fused: bool = False) -> dict:
+        """Profiling report and EDA strategy in one round-trip: both calls at once, or a single call when fused."""
+        if not fused:
+            # The strategy only reads Domain_expert, so neither call waits for the other.
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                report = pool.submit(contextvars.copy_context().run, self.Dataset_profiling, state)
+                strategy = pool.submit(contextvars.copy_context().run, self.EDA_Strategy_Generator, state)
+                return {**report.result(), **strategy.result()}
+
+        prompt = f"""
+        You are an EDA specialist. From the basic EDA analysis and the domain expertise below, produce:
+        profiling_report: a detailed dataset profiling report based on the basic EDA analysis.
+        Report: a detailed plan outlining the EDA approach.
+        focus_areas: List of key areas to focus on during EDA,should be amoung (descriptive_analysis, correlation_analysis, outlier_detection,feature_ranking).
+        red_flags: List of potential issues or concerns to watch out for.
+        analysis_to_run: List of specific analyses to be conducted.
+        analysis_to_skip: List of analyses that are not necessary and takes lots of computation.
+        priority_order: List of priorities for the analyses.
+
+        Basic_EDA_analysis:{compact_profile(state["Dataset_profiler"], PROMPT_BUDGETS["Dataset_profiling"])}
+        Domain_expertise:{state["Domain_expert"]}"""
+        prompt_stats.record("EDA_Plan", prompt)
+        result = self.llm.with_structured_output(EDAPlan).invoke(prompt)
+        plan = result.model_dump() if hasattr(result, "model_dump") else dict(result)
+        return {
+            "EDA_report_generator": plan.pop("profiling_report", ""),
+            "EDA_Resonner": plan,
+        }
     def EDA_Report(self,df_sample,state:State)->dict:
         problem_type = state["Domain_expert"].get("problem_type", "unknown") if isinstance(state["Domain_expert"], dict) else "unknown"
         
-        result = self.llm.with_structured_output(EDAReport).invoke(f"""You are an EDA Report writer specialist. Create a professional EDA report.
+        prompt = f"""You are an EDA Report writer specialist. Create a professional EDA report.
 
 Problem Type: {problem_type}
 
@@ -75,7 +109,9 @@ Generate a JSON report with:
 - modeling_implications: Impact on modeling
 - next_steps: Recommended next steps
 
-Keep responses concise and focused.""")
+Keep responses concise and focused."""
+        prompt_stats.record("EDA_Report", prompt)
+        result = self.llm.with_structured_output(EDAReport).invoke(prompt)
         
         return {
             "EDA_Report": result.model_dump() if hasattr(result, "model_dump") else result
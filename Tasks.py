@@ -1,27 +1,56 @@
 from typing_extensions import TypedDict
-from typing import Optional,Literal,List,Dict
+from typing import Annotated,Optional,Literal,List,Dict
 from pydantic import BaseModel
+import json
+import os
 import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from joblib import Parallel, cpu_count, delayed
+from duplicates import find_duplicates
+from sketches import HyperLogLog, KLLSketch, hash_arrow_strings
+from correlation import CORRELATION_METHODS, correlation_summary, frame_comoments, numeric_columns
 from sklearn.feature_selection import mutual_info_classif,mutual_info_regression
 
+try:
+    import pyarrow
+    import pyarrow.compute
+except ImportError:  # no Arrow-backed string columns to profile
+    pyarrow = None
+
+def merge_executer_results(left: dict, right: dict) -> dict:
+    # Executors run in parallel and each contributes its own focus-area key.
+    return {**(left or {}), **(right or {})}
+
+
 class State(TypedDict):
     Domain_expert: dict
     Dataset_profiler: str
     EDA_Resonner: str
-    EDA_Executer: dict
+    EDA_Executer: Annotated[dict, merge_executer_results]
     EDA_report_generator: str
 
+class DuplicateRows(BaseModel):
+    count: int
+    fraction: float
+    groups: int
+    example_groups: List[List[int]]
+    hash_collisions: int = 0
+    exact: bool = True
+
+
 class BasicEDA(BaseModel):
     shape: Optional[tuple] | None = None
     missing_values: Optional[dict] | None = None
     dtypes: Optional[dict] | None = None
     class_imbalance: Optional[dict] | None = None
     categorical_cardinality: Optional[Dict[str, int]] | None = None
-    duplicate_rows: Optional[List[str]] | None = None
+    duplicate_rows: Optional[DuplicateRows] | None = None
     constant_columns: Optional[List[str]] | None = None
     all_columns: Optional[List[str]] | None = None
     numeric_columns: Optional[List[str]] | None = None
     categorical_columns: Optional[List[str]] | None = None
+    approximate_values: Optional[Dict[str, List[str]]] | None = None
 
 
 class EDAStrategy(BaseModel):
@@ -33,6 +62,11 @@ class EDAStrategy(BaseModel):
     priority_order: List[str]
 
 
+class EDAPlan(EDAStrategy):
+    # Fused strategy mode: the profiling narrative and the strategy from one call.
+    profiling_report: str
+
+
 class ProblemType(BaseModel):
     problem_type: Literal["regression", "classification", "clustering"] = (
         "unknown"
@@ -50,162 +84,399 @@ class EDAReport(BaseModel):
     next_steps: List[str]
 
 
+# Opt-in approximate mode for very large columns: HyperLogLog distinct counts and
+# KLL quartiles (see sketches.py for error bounds). BasicEDA.approximate_values
+# lists every value that came from a sketch.
+SKETCH_MODE = os.getenv("EDA_SKETCH_MODE", "off").lower() in ("1", "on", "true")
+SKETCH_BLOCK_ROWS = 65536
+
+OUTLIER_METHODS = [m.strip() for m in os.getenv("EDA_OUTLIER_METHODS", "iqr").split(",") if m.strip()]
+OUTLIER_SAMPLE_SIZE = int(os.getenv("EDA_OUTLIER_SAMPLE_SIZE", "20"))
+
+
+def outlier_bounds(X: pd.DataFrame, method: str):
+    """Per-column (lower, upper) bound arrays; values strictly outside are outliers."""
+    if method == "iqr" and SKETCH_MODE:
+        q = np.array([column_sketch(X[c]).quantiles([0.25, 0.75]) for c in X.columns]).reshape(-1, 2).T
+        iqr = q[1] - q[0]
+        return q[0] - 1.5 * iqr, q[1] + 1.5 * iqr
+    if method == "iqr":
+        q = X.quantile([0.25, 0.75]).to_numpy(dtype="float64")
+        iqr = q[1] - q[0]
+        return q[0] - 1.5 * iqr, q[1] + 1.5 * iqr
+    if method == "zscore":
+        mean = X.mean().to_numpy(dtype="float64")
+        std = X.std().to_numpy(dtype="float64")
+        return mean - 3 * std, mean + 3 * std
+    if method == "mad":
+        median = X.median()
+        mad = (X - median).abs().median().to_numpy(dtype="float64") / 0.6745
+        median = median.to_numpy(dtype="float64")
+        return median - 3.5 * mad, median + 3.5 * mad
+    raise ValueError(f"Unknown outlier detection method: {method}")
+
+
+def column_sketch(series: pd.Series) -> KLLSketch:
+    sketch = KLLSketch()
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    for start in range(0, len(values), SKETCH_BLOCK_ROWS):
+        sketch.update(values[start : start + SKETCH_BLOCK_ROWS])
+    return sketch
+
+
+def numeric_matrix(df: pd.DataFrame, columns) -> np.ndarray:
+    """float64 (rows, columns) array filled column by column, without copying the frame first."""
+    values = np.empty((len(df), len(columns)), dtype="float64", order="F")
+    for j, col in enumerate(columns):
+        values[:, j] = df[col].to_numpy(dtype="float64", na_value=np.nan)
+    return values
+
+
+def summarize_outliers(columns, mask, index, non_null, lower, upper) -> dict:
+    counts = mask.sum(axis=0)
+    summary = {}
+    for j, col in enumerate(columns):
+        rows = np.flatnonzero(mask[:, j])[:OUTLIER_SAMPLE_SIZE]
+        summary[col] = {
+            "count": int(counts[j]),
+            "fraction": float(counts[j] / non_null[j]) if non_null[j] else 0.0,
+            "lower_bound": float(lower[j]),
+            "upper_bound": float(upper[j]),
+            "sample_indices": index[rows].tolist(),
+        }
+    return summary
+
+
+RANKING_SAMPLE_ROWS = int(os.getenv("EDA_RANKING_SAMPLE_ROWS", "20000"))
+RANKING_MIN_SAMPLE_ROWS = int(os.getenv("EDA_RANKING_MIN_SAMPLE_ROWS", "2000"))
+# Rows x features scored per sample; wide datasets get smaller samples so ranking cost stays bounded.
+RANKING_CELL_BUDGET = int(os.getenv("EDA_RANKING_CELL_BUDGET", "2000000"))
+RANKING_MIN_PER_STRATUM = int(os.getenv("EDA_RANKING_MIN_PER_STRATUM", "100"))
+RANKING_REPEATS = int(os.getenv("EDA_RANKING_REPEATS", "3"))
+# joblib's cpu_count() honours CPU affinity and container quotas.
+RANKING_JOBS = int(os.getenv("EDA_RANKING_JOBS", str(cpu_count())))
+# Below this many rows x features scored in total, ranking runs in-process: starting workers costs more.
+RANKING_PARALLEL_MIN_CELLS = int(os.getenv("EDA_RANKING_PARALLEL_MIN_CELLS", "1000000"))
+
+
+def encode_features(X: pd.DataFrame, columns=None, rows=None):
+    """Float matrix for mutual information plus a mask of which columns are discrete codes.
+
+    `columns` and `rows` (a boolean mask or row positions) select from X
+    column by column, so the frame itself is never copied and only the
+    selected rows are encoded.
+    """
+    columns = list(X.columns) if columns is None else columns
+    if rows is None:
+        n_rows = len(X)
+    else:
+        rows = np.asarray(rows)
+        n_rows = int(rows.sum()) if rows.dtype == bool else len(rows)
+    encoded = np.empty((n_rows, len(columns)), dtype="float64")
+    discrete = np.zeros(len(columns), dtype=bool)
+    for j, col in enumerate(columns):
+        series = X[col] if rows is None else X[col].iloc[rows]
+        if is_numeric_dtype(series.dtype) and not is_bool_dtype(series.dtype):
+            values = series.to_numpy(dtype="float64", na_value=np.nan)
+            if np.isnan(values).any():
+                values = np.where(np.isnan(values), np.nanmedian(values) if (~np.isnan(values)).any() else 0.0, values)
+            encoded[:, j] = values
+        else:
+            # Missing values keep their own code (-1) so they still carry information.
+            encoded[:, j] = pd.factorize(series)[0]
+            discrete[j] = True
+    return encoded, discrete
+
+
+def ranking_sample_size(n_rows: int, n_strata: int, n_features: int) -> int:
+    """Rows per ranking sample: RANKING_CELL_BUDGET spread over the features, between
+    RANKING_MIN_SAMPLE_ROWS (or enough for RANKING_MIN_PER_STRATUM rows per stratum)
+    and RANKING_SAMPLE_ROWS, and never more than the data has."""
+    size = min(RANKING_SAMPLE_ROWS, RANKING_CELL_BUDGET // max(1, n_features))
+    size = max(size, RANKING_MIN_SAMPLE_ROWS, RANKING_MIN_PER_STRATUM * n_strata)
+    return min(n_rows, size)
+
+
+def stratified_sample(strata: np.ndarray, size: int, rng) -> np.ndarray:
+    """Row positions drawn proportionally per stratum, never fewer than
+    RANKING_MIN_PER_STRATUM rows (or the whole stratum) so rare classes stay represented."""
+    n = len(strata)
+    if size >= n:
+        return np.arange(n)
+    strata = np.where(pd.isna(strata), -1, strata).astype("int64")
+    labels, inverse, counts = np.unique(strata, return_inverse=True, return_counts=True)
+    order = np.argsort(inverse, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    picked = []
+    for k in range(len(labels)):
+        members = order[starts[k] : starts[k] + counts[k]]
+        take = min(counts[k], max(RANKING_MIN_PER_STRATUM, int(round(size * counts[k] / n))))
+        picked.append(rng.choice(members, size=take, replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+def _mutual_info_block(X, y, discrete, classification, seed):
+    if classification:
+        return mutual_info_classif(X, y, discrete_features=discrete, random_state=seed)
+    return mutual_info_regression(X, y, discrete_features=discrete, random_state=seed)
+
+
+# Optional BasicEDA fields each problem type fills in; everything else is shared.
+PROFILE_FIELDS = {
+    "regression": (),
+    "classification": ("class_imbalance", "categorical_cardinality"),
+    "clustering": ("categorical_cardinality",),
+}
+
+
+# Target-independent work the graph runs while the Domain_expert call is in flight
+# ("profile", "descriptive", "correlation"); empty disables speculation. Profiling waits for all of it,
+# so descriptive and correlation only pay off when the strategy usually selects them.
+SPECULATIVE_TASKS = [t.strip() for t in os.getenv("EDA_SPECULATIVE_TASKS", "profile").split(",") if t.strip()]
+
+
+def column_profile(series: pd.Series) -> dict:
+    """Profile fields of one column that do not depend on which column is the target."""
+    n_rows = len(series)
+    is_numeric = is_numeric_dtype(series.dtype) and not is_bool_dtype(series.dtype)
+    distinct = None
+    approximate = False
+    if is_numeric:
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        null_mask = np.isnan(values)
+        missing = int(null_mask.sum())
+        if missing == n_rows:
+            constant = n_rows > 0
+        else:
+            valid = values[~null_mask] if missing else values
+            constant = missing == 0 and valid.min() == valid.max()
+    elif isinstance(series.dtype, pd.CategoricalDtype):
+        # Exact and cheap either way: the codes already number the distinct values.
+        codes = series.cat.codes.to_numpy()
+        present = codes[codes >= 0]
+        missing = n_rows - len(present)
+        distinct = int(np.count_nonzero(np.bincount(present, minlength=len(series.cat.categories))))
+        constant = distinct + (1 if missing else 0) == 1
+    elif SKETCH_MODE:
+        missing = int(series.isna().sum())
+        hll = HyperLogLog()
+        arrow_text = isinstance(series.dtype, pd.StringDtype) and series.dtype.storage == "pyarrow"
+        if arrow_text:
+            # Hashed from the Arrow buffers block by block; no Python strings are created.
+            dedupe = True
+            for start in range(0, n_rows, SKETCH_BLOCK_ROWS):
+                block = pyarrow.array(series.array[start : start + SKETCH_BLOCK_ROWS])
+                if dedupe:
+                    # Repeats don't change the sketch; stop deduplicating once a block is mostly distinct.
+                    unique = pyarrow.compute.unique(block)
+                    dedupe = len(unique) * 2 <= len(block)
+                    block = unique
+                hll.update_hashes(hash_arrow_strings(block))
+        else:
+            hll.update(series.dropna().to_numpy())
+        distinct = hll.count()
+        if distinct <= 2:
+            # Tiny cardinalities are cheap to confirm exactly and decide constant_columns.
+            distinct = int(series.nunique())
+        else:
+            approximate = True
+        constant = distinct + (1 if missing else 0) == 1
+    else:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        missing = int((codes == -1).sum())
+        distinct = len(uniques)
+        constant = distinct + (1 if missing else 0) == 1
+    return {
+        "dtype": str(series.dtype),
+        "numeric": is_numeric,
+        "missing": missing,
+        "constant": bool(constant),
+        "distinct": distinct,
+        "approximate": approximate,
+    }
+
+
 class EDA_Tasks:
-    def Dataset_profiling_regression(self,df, state: State) -> dict:
+    def Speculative_profiling(self, df, cache: dict) -> None:
+        """Fill `cache` with the SPECULATIVE_TASKS results; the target-specific nodes pick them up."""
+        if "profile" in SPECULATIVE_TASKS:
+            cache["columns"] = {col: column_profile(df[col]) for col in df.columns}
+            cache["duplicate_rows"] = find_duplicates(df)
+        if "descriptive" in SPECULATIVE_TASKS:
+            cache["descriptive"] = self.EDA_executer_descriptive(df, None)
+        if "correlation" in SPECULATIVE_TASKS:
+            columns = numeric_columns(df)
+            cache["correlation"] = {method: frame_comoments(df, columns, method) for method in CORRELATION_METHODS}
+
+    def Dataset_profiling(self, df, state: State, problem_type: str, cache: dict | None = None) -> dict:
+        cache = cache or {}
         target_variable = state["Domain_expert"]["target_variable"]
-        shape = df.shape
-        missing_values = {k: int(v) for k, v in df.isnull().sum().items()}
-        dtypes = {k: str(v) for k, v in df.dtypes.items()}
+        fields = PROFILE_FIELDS.get(problem_type, ())
+        profiles = cache.get("columns") or {col: column_profile(df[col]) for col in df.columns}
+
+        missing_values = {}
+        dtypes = {}
+        constant_columns = []
+        numeric_cols = []
+        categorical_cols = []
+        cardinality = {} if "categorical_cardinality" in fields else None
+        approximate = {}
+
+        for col, info in profiles.items():
+            missing_values[col] = info["missing"]
+            dtypes[col] = info["dtype"]
+            if info["constant"]:
+                constant_columns.append(col)
+            if col == target_variable:
+                continue
+            if info["numeric"]:
+                numeric_cols.append(col)
+                continue
+            categorical_cols.append(col)
+            if cardinality is not None:
+                cardinality[col] = int(info["distinct"])
+            if info["approximate"]:
+                approximate.setdefault("categorical_cardinality", []).append(col)
+
         class_imbalance = None
-        cardinality = None
-        duplicate_row = []
-        constant_columns = [x for x in df.columns if len(np.unique(df[x])) == 1]
-        all_columns = df.columns.tolist()
-        numeric_cols = [
-            x
-            for x in df.columns
-            if df[x].dtype in ["int64", "float64"] and x != target_variable
-        ]
-        categorical_cols = [
-            x for x in df.columns if x not in numeric_cols and x != target_variable
-        ]
+        if "class_imbalance" in fields and target_variable in profiles:
+            codes, uniques = pd.factorize(df[target_variable], use_na_sentinel=True)
+            counts = np.bincount(codes[codes != -1], minlength=len(uniques))
+            order = np.argsort(-counts, kind="stable")
+            labels = uniques.take(order).tolist()
+            class_imbalance = {k: int(counts[i]) for k, i in zip(labels, order)}
 
         result = BasicEDA(
-            shape=shape,
+            shape=df.shape,
             missing_values=missing_values,
             dtypes=dtypes,
             class_imbalance=class_imbalance,
             categorical_cardinality=cardinality,
-            duplicate_rows=duplicate_row,
+            duplicate_rows=DuplicateRows(**(cache.get("duplicate_rows") or find_duplicates(df))),
             constant_columns=constant_columns,
-            all_columns=all_columns,
+            all_columns=df.columns.tolist(),
             numeric_columns=numeric_cols,
             categorical_columns=categorical_cols,
+            approximate_values=approximate,
         )
 
         return {"Dataset_profiler": result.json()}
 
 
-    def Dataset_profiling_classification(self,df, state: State) -> dict:
-        target_variable = state["Domain_expert"]["target_variable"]
-        shape = df.shape
-        missing_values = {k: int(v) for k, v in df.isnull().sum().items()}
-        dtypes = {k: str(v) for k, v in df.dtypes.items()}
-        class_imbalance = {k: int(v) for k, v in df[target_variable].value_counts().items()}
-        duplicate_row = []
-        constant_columns = [x for x in df.columns if len(np.unique(df[x])) == 1]
-        all_columns = df.columns.tolist()
-        numeric_cols = [
-            x
-            for x in df.columns
-            if df[x].dtype in ["int64", "float64"] and x != target_variable
-        ]
-        categorical_cols = [
-            x for x in df.columns if x not in numeric_cols and x != target_variable
-        ]
-        cardinality = {x: int(df[x].nunique()) for x in categorical_cols}
-
-        result = BasicEDA(
-            shape=shape,
-            missing_values=missing_values,
-            dtypes=dtypes,
-            class_imbalance=class_imbalance,
-            categorical_cardinality=cardinality,
-            duplicate_rows=duplicate_row,
-            constant_columns=constant_columns,
-            all_columns=all_columns,
-            numeric_columns=numeric_cols,
-            categorical_columns=categorical_cols,
-        )
-
-        return {"Dataset_profiler": result.json()}
+    def Dataset_profiling_regression(self,df, state: State, cache: dict | None = None) -> dict:
+        return self.Dataset_profiling(df, state, "regression", cache)
 
 
-    def Dataset_profiling_clustering(self,df, state: State) -> dict:
-        target_variable = state["Domain_expert"]["target_variable"]
-        shape = df.shape
-        missing_values = {k: int(v) for k, v in df.isnull().sum().items()}
-        dtypes = {k: str(v) for k, v in df.dtypes.items()}
-        class_imbalance = None
-        duplicate_row = []
-        constant_columns = [x for x in df.columns if len(np.unique(df[x])) == 1]
-        all_columns = df.columns.tolist()
-        numeric_cols = [
-            x
-            for x in df.columns
-            if df[x].dtype in ["int64", "float64"] and x != target_variable
-        ]
-        categorical_cols = [
-            x for x in df.columns if x not in numeric_cols and x != target_variable
-        ]
-        cardinality = {x: int(df[x].nunique()) for x in categorical_cols}
+    def Dataset_profiling_classification(self,df, state: State, cache: dict | None = None) -> dict:
+        return self.Dataset_profiling(df, state, "classification", cache)
 
-        result = BasicEDA(
-            shape=shape,
-            missing_values=missing_values,
-            dtypes=dtypes,
-            class_imbalance=class_imbalance,
-            categorical_cardinality=cardinality,
-            duplicate_rows=duplicate_row,
-            constant_columns=constant_columns,
-            all_columns=all_columns,
-            numeric_columns=numeric_cols,
-            categorical_columns=categorical_cols,
-        )
 
-        return {"Dataset_profiler": result.json()}
+    def Dataset_profiling_clustering(self,df, state: State, cache: dict | None = None) -> dict:
+        return self.Dataset_profiling(df, state, "clustering", cache)
 
 
-    def EDA_executer_descriptive(self,df,state:State) -> dict:
+    def EDA_executer_descriptive(self,df,state:State, cache: dict | None = None) -> dict:
+        if cache and "descriptive" in cache:
+            return cache["descriptive"]
         return df.describe().to_dict()
 
 
-    def EDA_executer_correlation(self,df, state: State) -> dict:
+    def EDA_executer_correlation(self,df, state: State, cache: dict | None = None) -> dict:
         target_variable = state["Domain_expert"]["target_variable"]
-        X = df.drop(columns=[target_variable])
-        return X.corr().to_dict()
-
-
-    def EDA_executer_outlier_detection(self,df, state: State) -> dict:
+        columns = numeric_columns(df, exclude=[target_variable])
+        # Co-moments are pairwise, so dropping the target from the speculative all-column matrix is exact.
+        speculated = (cache or {}).get("correlation", {})
+        return {
+            method: correlation_summary(
+                speculated[method].subset(columns) if method in speculated else frame_comoments(df, columns, method)
+            )
+            for method in CORRELATION_METHODS
+        }
+
+
+    def EDA_executer_outlier_detection(self,df, state: State, cache: dict | None = None) -> dict:
         target_variable = state["Domain_expert"]["target_variable"]
-        numeric_cols = state["Dataset_profiler"]["numeric_columns"]
-        X = df.drop(columns=[target_variable])
-        outlier_dict = {}
-
-        for col in numeric_cols:
-            Q1 = X[col].quantile(0.25)
-            Q3 = X[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            outliers = X[(X[col] < lower_bound) | (X[col] > upper_bound)]
-            outlier_dict[col] = outliers.to_dict()
-
-        return outlier_dict
-
-
-    def EDA_executer_feature_ranking(self,df, state: State) -> dict:
+        profile = state["Dataset_profiler"]
+        if isinstance(profile, str):
+            profile = json.loads(profile)
+        numeric_cols = [c for c in profile["numeric_columns"] if c != target_variable]
+        values = numeric_matrix(df, numeric_cols)
+        # Column-major, so this frame wraps `values` without a copy.
+        X = pd.DataFrame(values, columns=numeric_cols, copy=False)
+        non_null = (~np.isnan(values)).sum(axis=0)
+
+        result = {}
+        for method in OUTLIER_METHODS:
+            lower, upper = outlier_bounds(X, method)
+            mask = (values < lower) | (values > upper)
+            result[method] = summarize_outliers(
+                numeric_cols, mask, df.index, non_null, lower, upper
+            )
+            if method == "iqr" and SKETCH_MODE:
+                for summary in result[method].values():
+                    summary["exact"] = False
+        return result
+
+
+    def EDA_executer_feature_ranking(self,df, state: State, cache: dict | None = None) -> dict:
         target_variable = state["Domain_expert"]["target_variable"]
         problem_type = state["Domain_expert"]["problem_type"]
-        X = df.drop(columns=[target_variable])
-        y = df[target_variable]
-        feature_ranking = {}
-
-        if problem_type == "regression":
-            mi_scores = mutual_info_regression(X, y)
-        elif problem_type == "classification":
-            mi_scores = mutual_info_classif(X, y)
-        else:
+
+        if problem_type not in ("regression", "classification"):
             return {
                 "feature_ranking": "Feature ranking not applicable for clustering or unknown problem types."
             }
 
-        for col, score in zip(X.columns, mi_scores):
-            feature_ranking[col] = float(score)
-
-        sorted_ranking = dict(
-            sorted(feature_ranking.items(), key=lambda item: item[1], reverse=True)
+        classification = problem_type == "classification"
+        target = df[target_variable]
+        valid = np.flatnonzero(target.notna().to_numpy())
+        if len(valid) < len(target):
+            target = target.iloc[valid]
+        features = [c for c in df.columns if c != target_variable]
+        if classification:
+            y = pd.factorize(target)[0]
+            strata = y
+        else:
+            y = pd.to_numeric(target, errors="coerce").to_numpy(dtype="float64")
+            strata = pd.qcut(y, q=10, labels=False, duplicates="drop")
+
+        # Samples are drawn from the target alone; only the rows they pick are encoded.
+        sample_size = ranking_sample_size(len(y), len(pd.unique(strata)), len(features))
+        if RANKING_REPEATS * sample_size >= len(y):
+            # Sampling only saves work when the repeats together score fewer rows than one full pass.
+            samples = [np.arange(len(y))]
+        else:
+            rng = np.random.default_rng(0)
+            samples = [stratified_sample(strata, sample_size, rng) for _ in range(RANKING_REPEATS)]
+        picked = samples[0] if len(samples) == 1 else np.unique(np.concatenate(samples))
+        X, discrete = encode_features(df, features, None if len(picked) == len(df) else valid[picked])
+        local = [np.searchsorted(picked, sample) for sample in samples]
+
+        cells = sum(len(sample) for sample in samples) * X.shape[1]
+        n_jobs = RANKING_JOBS if cells >= RANKING_PARALLEL_MIN_CELLS else 1
+        blocks = np.array_split(np.arange(X.shape[1]), max(1, min(X.shape[1], n_jobs * 2)))
+        scores = Parallel(n_jobs=n_jobs)(
+            delayed(_mutual_info_block)(
+                X[:, cols] if len(rows) == len(X) else X[np.ix_(rows, cols)],
+                y[sample],
+                discrete[cols],
+                classification,
+                seed,
+            )
+            for seed, (sample, rows) in enumerate(zip(samples, local))
+            for cols in blocks
+            if len(cols)
         )
-        return {"feature_ranking": sorted_ranking}
-
-   
\ No newline at end of file
+        scores = np.vstack(
+            [np.concatenate(scores[i : i + len(blocks)]) for i in range(0, len(scores), len(blocks))]
+        )
+        mean = scores.mean(axis=0)
+        order = np.argsort(-mean, kind="stable")
+        return {
+            "feature_ranking": {features[i]: float(mean[i]) for i in order},
+            # Spread across samples; a single pass over the whole dataset has none to report.
+            "stability": {features[i]: float(s) for i, s in zip(order, scores.std(axis=0)[order])} if len(samples) > 1 else None,
+            "sample_rows": int(len(samples[0])),
+            "total_rows": int(len(y)),
+            "repeats": len(samples),
+        }
@@ -1,9 +1,17 @@
-from fastapi import FastAPI, File, UploadFile
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
+import json
 import os
-from main import get_eda
+from jobs import JobManager, QueueFullError
+from metrics import registry
+from payloads import PAGE_SIZE, dumps, encode, page, summarize
+from main import dataset_cache, eda_agents, get_eda, stream_eda
+from prompt_compaction import PROMPT_BUDGETS, prompt_stats
+from uploads import ALLOWED_EXTENSIONS, MAX_UPLOAD_MB, UPLOAD_DIR, UploadTooLargeError, store_upload
 
 app = FastAPI()
 
@@ -16,20 +24,66 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Analyses run on a bounded worker pool so the event loop stays free for other requests.
+job_manager = JobManager(get_eda, stream_eda)
+
 class FileInput(BaseModel):
     file_path: Optional[str] = None
 
 class EDA_Agent_Response(BaseModel):
     Domain_expert: Optional[dict] = None
-    Dataset_profiler: Optional[str] = None
+    Dataset_profiler: Optional[dict | str] = None
     EDA_Resonner: Optional[str] = None
+    EDA_Executer: Optional[dict] = None
     EDA_report_generator: Optional[str] = None
+    timings: Optional[dict] = None
+
+def parse_profile(profile):
+    # The profile is stored as one JSON string; as an object its per-column tables can be summarized and paged.
+    if isinstance(profile, str) and profile:
+        try:
+            return json.loads(profile)
+        except ValueError:
+            pass
+    return profile
+
+
+def build_response(result: dict) -> dict:
+    response_data = {
+        "Domain_expert": result.get("Domain_expert"),
+        "Dataset_profiler": parse_profile(result.get("Dataset_profiler")),
+        "EDA_Resonner": result.get("EDA_Resonner"),
+        "EDA_Executer": result.get("EDA_Executer"),
+        "EDA_report_generator": result.get("EDA_report_generator"),
+        "timings": result.get("timings"),
+    }
+    if "error" in result:
+        response_data["error"] = result["error"]
+    return response_data
+
+
+def payload_response(request: Request, content, status_code: int = 200) -> Response:
+    body, headers = encode(content, request.headers.get("accept-encoding"))
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
+
+
+def result_payload(job, full: bool = False) -> dict:
+    """The job's result, summary-first unless `full`; deferred sections page through /jobs/{id}/result/<pointer>."""
+    response_data = build_response(job.result or {})
+    if not full:
+        response_data = summarize(response_data, f"/jobs/{job.job_id}/result")
+    response_data["job_id"] = job.job_id
+    return response_data
+
+
+def result_response(request: Request, job, full: bool = False) -> Response:
+    return payload_response(request, result_payload(job, full))
+
 
 @app.post("/upload")
-async def upload_file(file_input: FileInput):
+async def upload_file(file_input: FileInput, request: Request, full: bool = False):
     try:
         if not file_input.file_path:
             return {
@@ -50,7 +104,17 @@ async def upload_file(file_input: FileInput):
             }
         
         print(f"Starting EDA analysis for file: {file_input.file_path}")
-        result = get_eda(file_path=file_input.file_path)
+        try:
+            job = job_manager.submit(file_input.file_path)
+        except QueueFullError as e:
+            return {
+                "error": str(e),
+                "Domain_expert": None,
+                "Dataset_profiler": None,
+                "EDA_Resonner": None,
+                "EDA_report_generator": None
+            }
+        result = await asyncio.wrap_future(job.future)
         
         if result is None:
             return {
@@ -63,19 +127,8 @@ async def upload_file(file_input: FileInput):
         
         print(f"EDA analysis completed. Result keys: {result.keys() if isinstance(result, dict) else 'Not a dict'}")
         
-        # Ensure we return a proper response
-        response_data = {
-            "Domain_expert": result.get("Domain_expert"),
-            "Dataset_profiler": result.get("Dataset_profiler"),
-            "EDA_Resonner": result.get("EDA_Resonner"),
-            "EDA_report_generator": result.get("EDA_report_generator"),
-        }
-        
-        if "error" in result:
-            response_data["error"] = result["error"]
-        
-        print(f"Returning response: {response_data}")
-        return response_data
+        # Summarizing and compressing a large result is CPU work; keep it off the event loop.
+        return await asyncio.to_thread(result_response, request, job, full)
         
     except Exception as e:
         print(f"Error in upload_file: {str(e)}")
@@ -91,4 +144,155 @@ async def upload_file(file_input: FileInput):
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(file_input: FileInput):
+    if not file_input.file_path:
+        raise HTTPException(status_code=400, detail="No file path provided")
+    if not os.path.exists(file_input.file_path):
+        raise HTTPException(status_code=404, detail=f"File not found: {file_input.file_path}")
+    try:
+        job = job_manager.submit(file_input.file_path)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    return {"job_id": job.job_id, "status": job.status}
+
+
+@app.post("/files", status_code=201)
+async def upload_stream(request: Request, filename: str = "dataset.csv", start: bool = True):
+    """Raw request body (not multipart) streamed to disk; optionally queues the analysis."""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in ALLOWED_EXTENSIONS:
+        raise HTTPException(status_code=415, detail=f"Unsupported file type: {filename}")
+    max_bytes = int(MAX_UPLOAD_MB * 1024 * 1024)
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds the {max_bytes} byte limit")
+    try:
+        stored = await store_upload(request.stream(), extension, UPLOAD_DIR, max_bytes)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    dataset_cache.register(stored.file_path, stored.digest)
+
+    response = {"filename": filename, **stored.to_dict()}
+    if start:
+        try:
+            job = job_manager.submit(stored.file_path)
+        except QueueFullError as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+        response.update(job_id=job.job_id, status=job.status)
+    return response
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job.to_dict()
+
+
+def _finished_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if job.status in ("queued", "running"):
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return job
+
+
+# Plain `def` endpoints run in the threadpool, so encoding large payloads does not block the event loop.
+@app.get("/jobs/{job_id}/result")
+def job_result(job_id: str, request: Request, full: bool = False):
+    job = _finished_job(job_id)
+    if job.result is None:
+        return {"error": job.error, **job.to_dict()}
+    return result_response(request, job, full)
+
+
+@app.get("/jobs/{job_id}/result/{pointer:path}")
+def job_result_section(job_id: str, pointer: str, request: Request, offset: int = 0, limit: int = PAGE_SIZE):
+    """One page of a deferred result section, addressed by its JSON pointer."""
+    job = _finished_job(job_id)
+    if job.result is None:
+        raise HTTPException(status_code=404, detail=f"Job has no result: {job.error}")
+    try:
+        content = page(build_response(job.result), "/" + pointer, offset, limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No result section at /{pointer}")
+    except TypeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return payload_response(request, content)
+
+
+@app.get("/jobs")
+async def job_queue_stats():
+    return job_manager.stats()
+
+
+def _sse_message(job, event: dict, full: bool) -> str:
+    if event["event"] == "result":
+        # The job has its result by now, so deferred sections can be paged as soon as this arrives.
+        event["result"] = result_payload(job, full)
+    elif event.get("output"):
+        if "Dataset_profiler" in event["output"]:
+            event["output"] = {**event["output"], "Dataset_profiler": parse_profile(event["output"]["Dataset_profiler"])}
+        if not full:
+            event["output"] = summarize(event["output"], f"/jobs/{job.job_id}/result")
+    return f"event: {event['event']}\ndata: {dumps(event).decode()}\n\n"
+
+
+async def _sse_events(job, messages: asyncio.Queue):
+    yield f"event: job\ndata: {dumps({'event': 'job', **job.to_dict()}).decode()}\n\n"
+    while (message := await messages.get()) is not None:
+        yield message
+
+
+@app.post("/stream")
+async def stream_analysis(file_input: FileInput, full: bool = False):
+    if not file_input.file_path:
+        raise HTTPException(status_code=400, detail="No file path provided")
+    if not os.path.exists(file_input.file_path):
+        raise HTTPException(status_code=404, detail=f"File not found: {file_input.file_path}")
+    loop = asyncio.get_running_loop()
+    messages = asyncio.Queue()
+
+    def on_event(job, event):
+        # Called on the job's worker thread: events are encoded there and handed to the event loop,
+        # so an open stream holds no threadpool thread while the analysis runs.
+        try:
+            message = None if event is None else _sse_message(job, event, full)
+        except Exception as e:
+            message = f"event: error\ndata: {dumps({'event': 'error', 'error': str(e)}).decode()}\n\n"
+        try:
+            loop.call_soon_threadsafe(messages.put_nowait, message)
+        except RuntimeError:
+            pass  # event loop closed (server shutting down)
+
+    # Streamed runs share the job queue with /upload and /jobs, and are kept as jobs for paging.
+    try:
+        job = job_manager.submit(file_input.file_path, on_event=on_event)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    return StreamingResponse(
+        _sse_events(job, messages),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {"llm": eda_agents.llm.stats(), "dataset": dataset_cache.stats()}
+
+
+@app.get("/prompts/stats")
+async def prompts_stats():
+    return {"budgets": PROMPT_BUDGETS, "agents": prompt_stats.snapshot()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,9 +1,44 @@
 import streamlit as st
 import requests
-import os
 import json
 
 BASE_URL = "http://127.0.0.1:8000"
+PAGE_SIZE = 50
+
+
+@st.cache_data(show_spinner=False)
+def fetch_page(href: str, offset: int) -> dict:
+    # Deferred result sections are fetched a page at a time, only when asked for.
+    response = requests.get(f"{BASE_URL}{href}", params={"offset": offset, "limit": PAGE_SIZE}, timeout=(10, 60))
+    response.raise_for_status()
+    return response.json()
+
+
+def has_deferred(value) -> bool:
+    if isinstance(value, dict):
+        return bool(value.get("deferred")) or any(has_deferred(v) for v in value.values())
+    if isinstance(value, list):
+        return any(has_deferred(v) for v in value)
+    return False
+
+
+def show_result_section(value, key: str):
+    if isinstance(value, dict) and value.get("deferred"):
+        st.caption(f"{value['items']} entries, about {value['bytes'] / 1024:.0f} KiB")
+        if st.checkbox("Load", key=f"load:{key}"):
+            pages = max(1, -(-value["items"] // PAGE_SIZE))
+            page = st.number_input("Page", min_value=1, max_value=pages, key=f"page:{key}") if pages > 1 else 1
+            try:
+                st.json(fetch_page(value["href"], (page - 1) * PAGE_SIZE)["items"], expanded=False)
+            except requests.exceptions.RequestException as e:
+                st.error(f"Could not load {value['pointer']}: {e}")
+    elif isinstance(value, (dict, list)) and has_deferred(value):
+        for name, child in (value.items() if isinstance(value, dict) else enumerate(value)):
+            st.markdown(f"**{name}**")
+            show_result_section(child, f"{key}/{name}")
+    else:
+        st.json(value, expanded=False)
+
 
 # Initialize session state
 if "analysis_result" not in st.session_state:
@@ -12,9 +47,6 @@ if "error_message" not in st.session_state:
     st.session_state.error_message = None
 
 # Streamlit app to interact with the FastAPI backend
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 st.title("EDA_Agent")
 st.header("Upload your dataset for EDA in .csv format")
 
@@ -26,26 +58,50 @@ uploaded_file = st.file_uploader(
 
 if uploaded_file is not None:
     if st.button("Upload dataset", key="dataset_uploader_button"):
-        # Save the uploaded file temporarily
-        file_path = os.path.join(UPLOAD_DIR, uploaded_file.name)
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        
         st.info(f"Uploading {uploaded_file.name}...")
         
-        # Send to API
+        # Stream per-node progress from the API and render each result as it arrives
         try:
-            response = requests.post(
-                f"{BASE_URL}/upload",
-                json={"file_path": file_path},
-                timeout=300  # 5 minute timeout for long-running analysis
+            # Send the file body to the API (no shared filesystem needed); analysis starts below via /stream.
+            uploaded_file.seek(0)
+            upload = requests.post(
+                f"{BASE_URL}/files",
+                params={"filename": uploaded_file.name, "start": "false"},
+                data=uploaded_file,
+                headers={"Content-Type": "application/octet-stream"},
+                timeout=(10, 300),
             )
-            response.raise_for_status()
-            result = response.json()
-            
-            # Debug: Print the response structure
-            st.write("📋 Raw API Response:")
-            st.json(result)
+            upload.raise_for_status()
+            file_path = upload.json()["file_path"]
+
+            progress = st.status("Running EDA analysis...", expanded=True)
+            result = None
+            with requests.post(
+                f"{BASE_URL}/stream",
+                json={"file_path": file_path},
+                stream=True,
+                timeout=(10, 300)  # read timeout applies between events, not to the whole run
+            ) as response:
+                if response.status_code == 429:
+                    raise requests.exceptions.RequestException("The server is busy with other analyses; try again shortly.")
+                response.raise_for_status()
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data: "):
+                        continue
+                    event = json.loads(line[len("data: "):])
+                    if event["event"] == "node":
+                        duration = event.get("duration_s") or 0.0
+                        progress.write(f"✅ {event['node']} ({duration:.2f}s, {event['elapsed_s']:.1f}s elapsed)")
+                        if event.get("output"):
+                            progress.json(event["output"], expanded=False)
+                    elif event["event"] == "result":
+                        result = event["result"]
+                    elif event["event"] == "error":
+                        result = {"error": event["error"]}
+
+            if result is None:
+                result = {"error": "Stream ended without a result"}
+            progress.update(label="EDA analysis finished", state="error" if result.get("error") else "complete")
             
             # Check for errors in the response
             if result.get("error"):
@@ -92,7 +148,9 @@ if st.session_state.analysis_result:
     
     with col2:
         st.subheader("📈 Dataset Profile")
-        if result.get("Dataset_profiler"):
+        if isinstance(result.get("Dataset_profiler"), dict):
+            show_result_section(result["Dataset_profiler"], "Dataset_profiler")
+        elif result.get("Dataset_profiler"):
             st.text(str(result["Dataset_profiler"])[:500])  # Show first 500 chars
         else:
             st.info("No dataset profile available")
@@ -110,6 +168,16 @@ if st.session_state.analysis_result:
     
     st.divider()
     
+    st.subheader("🔬 EDA Executor Results")
+    if result.get("EDA_Executer"):
+        for area, section in result["EDA_Executer"].items():
+            with st.expander(area):
+                show_result_section(section, area)
+    else:
+        st.info("No executor results available")
+
+    st.divider()
+
     st.subheader("📋 EDA Report")
     if result.get("EDA_report_generator"):
         if isinstance(result["EDA_report_generator"], dict):
@@ -1,6 +1,6 @@
 import streamlit as st
 import os
-from main import get_eda
+from main import stream_eda
 
 
 if "analysis_result" not in st.session_state:
@@ -29,13 +29,21 @@ if uploaded_file is not None:
         
         st.info(f"Processing {uploaded_file.name}...")
         
-        # Call get_eda directly (returns dict, not requests.Response)
+        # Run the graph in-process and render each node's output as it finishes
         try:
-            result = get_eda(file_path=file_path)
-            
-            # Debug: Print the response structure
-            st.write("📋 Analysis Result:")
-            st.json(result)
+            progress = st.status("Running EDA analysis...", expanded=True)
+            result = None
+            for event in stream_eda(file_path=file_path):
+                if event["event"] == "node":
+                    duration = event.get("duration_s") or 0.0
+                    progress.write(f"✅ {event['node']} ({duration:.2f}s, {event['elapsed_s']:.1f}s elapsed)")
+                    if event.get("output"):
+                        progress.json(event["output"], expanded=False)
+                elif event["event"] == "result":
+                    result = event["result"]
+                elif event["event"] == "error":
+                    result = {"error": event["error"]}
+            progress.update(label="EDA analysis finished", state="error" if not result or result.get("error") else "complete")
             
             # Check for errors in the response
             if isinstance(result, dict) and result.get("error"):
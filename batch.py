@@ -0,0 +1,158 @@
+"""Run the EDA workflow over many CSV files in a process pool, appending one JSON line per dataset.
+
+    python batch.py exports/ --output nightly.jsonl --workers 8 --llm-concurrency 4
+    python batch.py "exports/**/*.csv" --output nightly.jsonl     # rerun: finished files are skipped
+    python batch.py exports/ --output nightly.jsonl --incremental  # grown files: only appended rows are read
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+BATCH_WORKERS = int(os.getenv("EDA_BATCH_WORKERS", str(os.cpu_count() or 1)))
+BATCH_LLM_CONCURRENCY = int(os.getenv("EDA_BATCH_LLM_CONCURRENCY", "4"))
+
+RESULT_KEYS = ("Domain_expert", "Dataset_profiler", "EDA_Resonner", "EDA_Executer", "EDA_report_generator", "timings", "error")
+
+_worker = {}
+
+
+def _init_worker(llm_semaphore, streaming, incremental):
+    # Each worker analyses one dataset at a time; nested process pools would only oversubscribe the cores.
+    os.environ.setdefault("EDA_RANKING_JOBS", "1")
+    import main
+    from llm_backends import ConcurrencyLimitedLLM
+
+    # One compiled graph and one LLM client per worker process; the semaphore caps LLM calls across all of them.
+    main.eda_agents.llm.llm = ConcurrencyLimitedLLM(main.eda_agents.llm.llm, llm_semaphore)
+    _worker.update(get_eda=main.get_eda, streaming=streaming, incremental=incremental)
+
+
+def _run_one(file_path: str) -> dict:
+    start = time.perf_counter()
+    try:
+        result = _worker["get_eda"](file_path, streaming=_worker["streaming"], incremental=_worker["incremental"])
+        result = {k: result[k] for k in RESULT_KEYS if k in result}
+    except Exception as e:
+        result = {"error": str(e)}
+    return {
+        "status": "error" if result.get("error") else "ok",
+        "elapsed_s": time.perf_counter() - start,
+        "pid": os.getpid(),
+        "result": result,
+    }
+
+
+def fingerprint(file_path: str) -> dict:
+    st = os.stat(file_path)
+    return {"file_path": os.path.abspath(file_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _key(record: dict) -> tuple:
+    return record["file_path"], record["size"], record["mtime_ns"]
+
+
+def discover(inputs, recursive: bool = False) -> list:
+    """CSV files under directories, plus glob patterns and plain paths, de-duplicated in order."""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = os.path.join(item, "**", "*.csv") if recursive else os.path.join(item, "*.csv")
+            files += sorted(glob.glob(pattern, recursive=recursive))
+        else:
+            files += sorted(glob.glob(item, recursive=True)) or ([item] if os.path.isfile(item) else [])
+    return list(dict.fromkeys(os.path.abspath(f) for f in files))
+
+
+def load_finished(output: str, retry_failed: bool = False) -> set:
+    """Keys of datasets already in the output file; a truncated last line from a crash is ignored."""
+    finished = set()
+    if not os.path.exists(output):
+        return finished
+    with open(output) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok" or not retry_failed:
+                finished.add(_key(record))
+    return finished
+
+
+def _append(f, record: dict):
+    f.write(json.dumps(record, default=str) + "\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def run_batch(files, output: str, workers: int = BATCH_WORKERS, llm_concurrency: int = BATCH_LLM_CONCURRENCY, streaming=None, retry_failed: bool = False, incremental=None) -> dict:
+    finished = load_finished(output, retry_failed)
+    pending = [fp for fp in map(fingerprint, files) if _key(fp) not in finished]
+    counts = {"skipped": len(files) - len(pending), "ok": 0, "error": 0}
+    print(f"{len(files)} datasets, {counts['skipped']} already done, {len(pending)} to run", file=sys.stderr)
+    if not pending:
+        return counts
+
+    semaphore = multiprocessing.BoundedSemaphore(max(1, llm_concurrency))
+    if os.path.exists(output) and os.path.getsize(output):
+        with open(output, "rb+") as f:
+            # Terminate a line cut short by a crash so the next record starts cleanly.
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    with open(output, "a") as f, ProcessPoolExecutor(
+        max_workers=max(1, min(workers, len(pending))),
+        initializer=_init_worker,
+        initargs=(semaphore, streaming, incremental),
+    ) as pool:
+        futures = {pool.submit(_run_one, fp["file_path"]): fp for fp in pending}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                record = {**futures[future], **future.result()}
+                _append(f, record)
+                counts[record["status"]] += 1
+                print(
+                    f"[{done}/{len(pending)}] {record['status']:<5} {record['file_path']} ({record['elapsed_s']:.1f}s)",
+                    file=sys.stderr,
+                )
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory). Unwritten datasets are picked up by the next run.
+            print("worker process died; rerun the same command to resume", file=sys.stderr)
+            counts["interrupted"] = len(pending) - counts["ok"] - counts["error"]
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="directories, glob patterns or CSV files")
+    parser.add_argument("--output", default="batch_results.jsonl")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    parser.add_argument("--llm-concurrency", type=int, default=BATCH_LLM_CONCURRENCY, help="LLM calls in flight across all workers")
+    parser.add_argument("--streaming", choices=["auto", "on", "off"], default="auto")
+    parser.add_argument("--recursive", action="store_true", help="include CSVs in subdirectories")
+    parser.add_argument("--incremental", action="store_true", default=None, help="reuse saved statistics and read only rows appended since the last run")
+    parser.add_argument("--retry-failed", action="store_true", help="rerun datasets whose last result was an error")
+    args = parser.parse_args()
+
+    files = discover(args.inputs, args.recursive)
+    counts = run_batch(
+        files,
+        args.output,
+        workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        streaming={"auto": None, "on": True, "off": False}[args.streaming],
+        retry_failed=args.retry_failed,
+        incremental=args.incremental,
+    )
+    print(json.dumps(counts), file=sys.stderr)
+    sys.exit(1 if counts.get("error") or counts.get("interrupted") else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Per-request overhead of building + compiling the LangGraph workflow vs reusing main.chain.
+
+LLM calls are replaced by an instant stub so only graph overhead is measured.
+
+    python benchmarks/bench_graph_compile.py --requests 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import main
+
+
+def stub_agents():
+    main.eda_agents.Domain_expert = lambda state, df, columns: {
+        "Domain_expert": {"problem_type": "classification", "target_variable": columns[-1]}
+    }
+    main.eda_agents.Dataset_profiling = lambda state: {"EDA_report_generator": ""}
+    main.eda_agents.EDA_Strategy_Generator = lambda state: {
+        "EDA_Resonner": {"focus_areas": ["descriptive_analysis"]}
+    }
+    main.eda_agents.EDA_Report = lambda df_sample, state: {}
+
+
+def timed(fn, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), statistics.mean(samples)
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument(
+        "--file",
+        default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads", "flower_dataset.csv"),
+    )
+    args = parser.parse_args()
+
+    # Nodes look up eda_agents methods when they run and read the dataset from config["configurable"],
+    # so the shared main.chain picks up the stubs without being rebuilt.
+    stub_agents()
+    run_context = main.load_run_context(args.file, streaming=False)
+    state = {"Domain_expert": {}, "Dataset_profiler": "", "EDA_Resonner": "", "EDA_Executer": {}, "EDA_report_generator": ""}
+    config = {"configurable": run_context}
+
+    compile_med, compile_mean = timed(main.build_workflow, args.requests)
+    per_request_med, per_request_mean = timed(
+        lambda: main.build_workflow().invoke(state, config=config), args.requests
+    )
+    shared_med, shared_mean = timed(lambda: main.chain.invoke(state, config=config), args.requests)
+
+    print(f"requests={args.requests}")
+    print(f"build+compile only          median={compile_med:8.2f}ms  mean={compile_mean:8.2f}ms")
+    print(f"compile per request + run   median={per_request_med:8.2f}ms  mean={per_request_mean:8.2f}ms")
+    print(f"shared compiled graph + run median={shared_med:8.2f}ms  mean={shared_mean:8.2f}ms")
+    print(f"overhead removed per request: {per_request_med - shared_med:.2f}ms (median)")
+
+
+if __name__ == "__main__":
+    run()
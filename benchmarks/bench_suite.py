@@ -0,0 +1,259 @@
+"""Wall time and peak memory of every EDA_Tasks function and of the full graph, over synthetic datasets.
+
+The LLM is replaced by benchmarks/fake_llm.FakeLLM, so numbers cover only the data side.
+Peak memory is measured with tracemalloc in a separate run (Python and numpy allocations;
+joblib worker processes used by feature ranking are not included).
+
+    python benchmarks/bench_suite.py --grid smoke --output baseline.json
+    python benchmarks/bench_suite.py --grid smoke --output new.json --compare baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+# Cold runs only: no parsed-CSV or LLM response cache between repeats.
+os.environ.setdefault("EDA_CACHE_ENABLED", "0")
+os.environ.setdefault("EDA_LLM_CACHE_ENABLED", "0")
+
+import main
+from fake_llm import FakeLLM
+from Tasks import EDA_Tasks
+
+GRIDS = {
+    "smoke": {"rows": [10_000], "cols": [10, 100], "mixes": ["numeric", "mixed"]},
+    "default": {"rows": [10_000, 100_000, 1_000_000], "cols": [10, 100, 500], "mixes": ["numeric", "mixed", "categorical"]},
+    "full": {
+        "rows": [10_000, 100_000, 1_000_000, 10_000_000],
+        "cols": [10, 100, 500, 2_000],
+        "mixes": ["numeric", "mixed", "categorical"],
+    },
+}
+
+# Column kinds cycled through for each dtype mix.
+MIXES = {
+    "numeric": ["float", "float_nan", "int"],
+    "mixed": ["float_nan", "int", "low_card", "high_card", "float"],
+    "categorical": ["low_card", "high_card", "low_card", "int"],
+}
+
+PROFILING_TASKS = ["Dataset_profiling_regression", "Dataset_profiling_classification", "Dataset_profiling_clustering"]
+EXECUTER_TASKS = list(main.FOCUS_AREA_EXECUTERS.values())
+
+
+def make_dataset(rows: int, cols: int, mix: str, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    low_vocab = np.array([f"level_{i}" for i in range(12)], dtype=object)
+    high_vocab = np.array([f"id_{i:07d}" for i in range(min(rows, 200_000))], dtype=object)
+    kinds = MIXES[mix]
+    data = {}
+    for i in range(cols - 1):
+        kind = kinds[i % len(kinds)]
+        if kind == "float":
+            col = rng.normal(size=rows)
+        elif kind == "float_nan":
+            col = rng.normal(size=rows)
+            col[rng.random(rows) < 0.05] = np.nan
+        elif kind == "int":
+            col = rng.integers(0, 1000, size=rows)
+        elif kind == "low_card":
+            col = low_vocab[rng.integers(0, len(low_vocab), size=rows)]
+        else:
+            col = high_vocab[rng.integers(0, len(high_vocab), size=rows)]
+        data[f"{kind}_{i}"] = col
+    data["target"] = rng.integers(0, 3, size=rows)
+    return pd.DataFrame(data)
+
+
+def measure(fn, repeat: int, memory: bool = True):
+    """Best-of-`repeat` wall time, then one traced run for peak memory. Returns (wall_s, peak_mb, result)."""
+    wall = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        wall = min(wall, time.perf_counter() - start)
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return wall, peak_mb, result
+
+
+def bench_tasks(df: pd.DataFrame, repeat: int, memory: bool) -> list:
+    tasks = EDA_Tasks()
+    state = {"Domain_expert": {"problem_type": "classification", "target_variable": "target"}}
+    records = []
+    # Measured on its own; the tasks below run without its cache so their numbers stay comparable.
+    wall, peak, _ = measure(lambda: tasks.Speculative_profiling(df, {}), repeat, memory)
+    records.append({"kind": "task", "node": "Speculative_profiling", "wall_s": wall, "peak_mb": peak})
+    for name in PROFILING_TASKS:
+        wall, peak, out = measure(lambda: getattr(tasks, name)(df=df, state=state), repeat, memory)
+        records.append({"kind": "task", "node": name, "wall_s": wall, "peak_mb": peak})
+        if name == "Dataset_profiling_classification":
+            state = {**state, **out}
+    for name in EXECUTER_TASKS:
+        wall, peak, _ = measure(lambda: getattr(tasks, name)(df=df, state=state), repeat, memory)
+        records.append({"kind": "task", "node": name, "wall_s": wall, "peak_mb": peak})
+    return records
+
+
+def bench_graph(df: pd.DataFrame, repeat: int, memory: bool, streaming) -> list:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dataset.csv")
+        df.to_csv(path, index=False)
+
+        def run():
+            timings = {}
+            for event in main.stream_eda(path, streaming=streaming):
+                if event["event"] == "error":
+                    raise RuntimeError(event["error"])
+                if event["event"] == "node":
+                    timings[event["node"]] = event["duration_s"] or 0.0
+                else:
+                    timings["total"] = event["elapsed_s"]
+            return timings
+
+        node_walls = {}
+        for _ in range(repeat):
+            for node, seconds in run().items():
+                node_walls[node] = min(node_walls.get(node, float("inf")), seconds)
+        _, peak, _ = measure(run, 0, memory)
+    return [
+        {"kind": "graph", "node": node, "wall_s": wall, "peak_mb": peak if node == "total" else None}
+        for node, wall in node_walls.items()
+    ]
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def compare(results: list, baseline: list, threshold: float, min_seconds: float, min_mb: float) -> list:
+    """Records whose wall time or peak memory grew by more than `threshold` (relative) over the baseline."""
+    old = {(r["dataset"], r["kind"], r["node"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        base = old.get((r["dataset"], r["kind"], r["node"]))
+        if base is None:
+            continue
+        for metric, floor in (("wall_s", min_seconds), ("peak_mb", min_mb)):
+            before, after = base.get(metric), r.get(metric)
+            if before is None or after is None:
+                continue
+            # Absolute floors keep millisecond-scale noise from being flagged.
+            if after > before * (1 + threshold) and after - before > floor:
+                regressions.append({
+                    "dataset": r["dataset"],
+                    "kind": r["kind"],
+                    "node": r["node"],
+                    "metric": metric,
+                    "baseline": before,
+                    "current": after,
+                    "change": after / before - 1 if before else float("inf"),
+                })
+    return regressions
+
+
+def _ints(text):
+    return [int(float(x)) for x in text.split(",") if x]
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grid", choices=sorted(GRIDS), default="smoke")
+    parser.add_argument("--rows", type=_ints, help="comma-separated, overrides the grid")
+    parser.add_argument("--cols", type=_ints, help="comma-separated, overrides the grid")
+    parser.add_argument("--mixes", type=lambda s: s.split(","), help=f"comma-separated from {sorted(MIXES)}")
+    parser.add_argument("--max-cells", type=float, default=5e7, help="skip datasets with more rows*cols")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--skip-graph", action="store_true")
+    parser.add_argument("--streaming", choices=["auto", "on", "off"], default="auto", help="graph load mode")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="baseline results file to check against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative increase counted as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.01)
+    parser.add_argument("--min-mb", type=float, default=1.0)
+    args = parser.parse_args()
+
+    grid = GRIDS[args.grid]
+    rows_grid = args.rows or grid["rows"]
+    cols_grid = args.cols or grid["cols"]
+    mixes = args.mixes or grid["mixes"]
+    streaming = {"auto": None, "on": True, "off": False}[args.streaming]
+    memory = not args.no_memory
+
+    fake = FakeLLM(problem_type="classification", target="target")
+    main.eda_agents.llm = fake
+
+    results, skipped = [], []
+    for rows in rows_grid:
+        for cols in cols_grid:
+            for mix in mixes:
+                dataset = f"{mix}_{rows}x{cols}"
+                if rows * cols > args.max_cells:
+                    skipped.append(dataset)
+                    print(f"skip {dataset}: {rows * cols:.0f} cells > --max-cells")
+                    continue
+                df = make_dataset(rows, cols, mix)
+                records = bench_tasks(df, args.repeat, memory)
+                if not args.skip_graph:
+                    records += bench_graph(df, args.repeat, memory, streaming)
+                for r in records:
+                    r.update(dataset=dataset, rows=rows, cols=cols, mix=mix)
+                    peak = f"{r['peak_mb']:9.1f}MB" if r["peak_mb"] is not None else " " * 11
+                    print(f"{dataset:<28} {r['kind']:<5} {r['node']:<36} {r['wall_s']:9.4f}s {peak}")
+                results += records
+                del df
+
+    report = {"meta": metadata(), "config": vars(args), "skipped": skipped, "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {len(results)} measurements to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, args.min_seconds, args.min_mb)
+        for r in regressions:
+            print(
+                f"REGRESSION {r['dataset']} {r['kind']} {r['node']} {r['metric']}: "
+                f"{r['baseline']:.4g} -> {r['current']:.4g} ({r['change']:+.0%})"
+            )
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} vs {args.compare}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    run()
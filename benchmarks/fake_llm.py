@@ -0,0 +1,61 @@
+"""Deterministic stand-in for the Groq chat model so benchmarks measure only the data side."""
+from Tasks import EDAPlan, EDAReport, EDAStrategy, ProblemType
+
+ALL_FOCUS_AREAS = ["descriptive_analysis", "correlation_analysis", "outlier_detection", "feature_ranking"]
+
+
+class _Message:
+    def __init__(self, content):
+        self.content = content
+
+
+class _Structured:
+    def __init__(self, llm, schema):
+        self.llm = llm
+        self.schema = schema
+
+    def invoke(self, prompt, *args, **kwargs):
+        self.llm.calls += 1
+        if self.schema is ProblemType:
+            return ProblemType(
+                problem_type=self.llm.problem_type,
+                target_variable=self.llm.target,
+                confidence_score_regression=float(self.llm.problem_type == "regression"),
+                confidence_score_classification=float(self.llm.problem_type == "classification"),
+                confidence_score_clustering=float(self.llm.problem_type == "clustering"),
+            )
+        if self.schema in (EDAStrategy, EDAPlan):
+            extra = {"profiling_report": "benchmark profile narrative"} if self.schema is EDAPlan else {}
+            return self.schema(
+                **extra,
+                Report="benchmark strategy",
+                focus_areas=list(self.llm.focus_areas),
+                red_flags=[],
+                analysis_to_run=[],
+                analysis_to_skip=[],
+                priority_order=list(self.llm.focus_areas),
+            )
+        if self.schema is EDAReport:
+            return EDAReport(
+                Report="benchmark report", key_insights=[], risks=[], modeling_implications=[], next_steps=[]
+            )
+        return self.schema.model_construct()
+
+
+class FakeLLM:
+    """Answers every prompt instantly with fixed, valid output. `calls` counts invocations."""
+
+    model_name = "fake-benchmark"
+
+    def __init__(self, problem_type="classification", target="target", focus_areas=ALL_FOCUS_AREAS):
+        self.problem_type = problem_type
+        self.target = target
+        self.focus_areas = focus_areas
+        self.calls = 0
+
+    def with_structured_output(self, schema, **options):
+        return _Structured(self, schema)
+
+    def invoke(self, prompt, *args, **kwargs):
+        self.calls += 1
+        return _Message("benchmark profile narrative")
@@ -0,0 +1,129 @@
+"""Throughput and latency percentiles of the analysis endpoints at several concurrency levels.
+
+Run the API against recorded LLM responses so no Groq calls are made:
+
+    EDA_LLM_BACKEND=record uvicorn api:app            # once, with a real key, to capture responses
+    EDA_LLM_BACKEND=replay EDA_REPLAY_LATENCY=0.5 uvicorn api:app
+    python benchmarks/load_test.py --file uploads/flower_dataset.csv --concurrency 1,4,16 --requests 32
+
+`--endpoint upload` times the blocking POST /upload; `--endpoint jobs` submits to POST /jobs and polls
+until the result is ready, counting 429 rejections separately.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(samples: list, q: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def call_api(method: str, url: str, timeout: float, payload: dict | None = None) -> tuple:
+    """(status, decoded JSON body) using only the standard library; HTTP errors are returned, not raised."""
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read() or b"null")
+    except urllib.error.HTTPError as e:
+        return e.code, None
+
+
+def run_upload(base_url: str, file_path: str, timeout: float) -> str:
+    status, body = call_api("POST", f"{base_url}/upload", timeout, {"file_path": file_path})
+    if status != 200:
+        return f"http_{status}"
+    return "error" if body.get("error") else "ok"
+
+
+def run_job(base_url: str, file_path: str, timeout: float, poll_s: float = 0.05) -> str:
+    status, body = call_api("POST", f"{base_url}/jobs", timeout, {"file_path": file_path})
+    if status == 429:
+        return "rejected"
+    if status != 202:
+        return f"http_{status}"
+    job_id = body["job_id"]
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status, result = call_api("GET", f"{base_url}/jobs/{job_id}/result", timeout)
+        if status == 409:
+            time.sleep(poll_s)
+            continue
+        if status != 200:
+            return f"http_{status}"
+        return "error" if result.get("error") else "ok"
+    return "timeout"
+
+
+def load_level(base_url: str, endpoint: str, file_path: str, concurrency: int, n_requests: int, timeout: float) -> dict:
+    call = run_upload if endpoint == "upload" else run_job
+
+    def one(_):
+        start = time.perf_counter()
+        try:
+            outcome = call(base_url, file_path, timeout)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            outcome = type(e).__name__
+        return outcome, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(n_requests)))
+    wall = time.perf_counter() - start
+
+    ok = [latency for outcome, latency in results if outcome == "ok"]
+    outcomes = {}
+    for outcome, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": n_requests,
+        "outcomes": outcomes,
+        "wall_s": wall,
+        "throughput_rps": len(ok) / wall if wall else 0.0,
+        "mean_s": statistics.mean(ok) if ok else float("nan"),
+        "p50_s": percentile(ok, 50),
+        "p95_s": percentile(ok, 95),
+        "p99_s": percentile(ok, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--file", required=True, help="CSV path as seen by the API server")
+    parser.add_argument("--endpoint", choices=["upload", "jobs"], default="upload")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated levels")
+    parser.add_argument("--requests", type=int, default=32, help="requests per level")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    file_path = os.path.abspath(args.file) if os.path.exists(args.file) else args.file
+    levels = [int(c) for c in args.concurrency.split(",") if c]
+    results = []
+    print(f"{'conc':>5} {'ok/total':>9} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}  outcomes")
+    for concurrency in levels:
+        r = load_level(args.url, args.endpoint, file_path, concurrency, args.requests, args.timeout)
+        results.append(r)
+        print(
+            f"{concurrency:>5} {r['outcomes'].get('ok', 0):>4}/{r['requests']:<4} {r['throughput_rps']:8.2f} "
+            f"{r['p50_s']:7.3f}s {r['p95_s']:7.3f}s {r['p99_s']:7.3f}s  {r['outcomes']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"url": args.url, "file": file_path, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
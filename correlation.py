@@ -0,0 +1,158 @@
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+CORRELATION_METHODS = [
+    m.strip() for m in os.getenv("EDA_CORRELATION_METHODS", "pearson").split(",") if m.strip()
+]
+CORRELATION_TOP_K = int(os.getenv("EDA_CORRELATION_TOP_K", "50"))
+DUPLICATE_THRESHOLD = float(os.getenv("EDA_CORRELATION_DUPLICATE_THRESHOLD", "0.98"))
+CORRELATION_CHUNK_ROWS = int(os.getenv("EDA_CORRELATION_CHUNK_ROWS", "100000"))
+
+
+def numeric_columns(df: pd.DataFrame, exclude=()) -> list:
+    return [
+        c
+        for c in df.columns
+        if c not in exclude and is_numeric_dtype(df[c].dtype) and not is_bool_dtype(df[c].dtype)
+    ]
+
+
+class CoMoments:
+    """Pairwise-complete Pearson co-moments for k columns.
+
+    Holds k x k matrices of pair counts and shifted sums (sum x, sum x^2,
+    sum xy over rows where both columns are present), so the result matches
+    DataFrame.corr() and partial aggregates merge by addition.
+    """
+
+    def __init__(self, columns: list, shift: np.ndarray):
+        k = len(columns)
+        self.columns = list(columns)
+        self.shift = np.asarray(shift, dtype="float64")
+        self.n = np.zeros((k, k))
+        self.sx = np.zeros((k, k))
+        self.sxx = np.zeros((k, k))
+        self.sxy = np.zeros((k, k))
+
+    def update(self, X: np.ndarray):
+        present = ~np.isnan(X)
+        if present.all():
+            # No gaps: every pair sees every row, so only the cross-product needs a matmul.
+            Z = X - self.shift
+            self.n += len(Z)
+            self.sx += Z.sum(axis=0)[:, None]
+            self.sxx += (Z * Z).sum(axis=0)[:, None]
+            self.sxy += Z.T @ Z
+            return
+        mask = present.astype("float64")
+        Z = np.where(present, X - self.shift, 0.0)
+        self.n += mask.T @ mask
+        self.sx += Z.T @ mask
+        self.sxx += (Z * Z).T @ mask
+        self.sxy += Z.T @ Z
+
+    def reshift(self, shift: np.ndarray):
+        d = self.shift - np.asarray(shift, dtype="float64")
+        di, dj = d[:, None], d[None, :]
+        self.sxy += dj * self.sx + di * self.sx.T + self.n * di * dj
+        self.sxx += 2 * di * self.sx + self.n * di**2
+        self.sx += self.n * di
+        self.shift = np.asarray(shift, dtype="float64")
+
+    def merge(self, other: "CoMoments") -> "CoMoments":
+        if not np.array_equal(other.shift, self.shift):
+            other.reshift(self.shift)
+        self.n += other.n
+        self.sx += other.sx
+        self.sxx += other.sxx
+        self.sxy += other.sxy
+        return self
+
+    def subset(self, columns: list) -> "CoMoments":
+        idx = [self.columns.index(c) for c in columns]
+        sub = CoMoments(columns, self.shift[idx])
+        ix = np.ix_(idx, idx)
+        sub.n, sub.sx, sub.sxx, sub.sxy = self.n[ix], self.sx[ix], self.sxx[ix], self.sxy[ix]
+        return sub
+
+    def corr(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n = np.where(self.n > 0, self.n, np.nan)
+            cov = self.sxy - self.sx * self.sx.T / n
+            var_i = self.sxx - self.sx**2 / n
+            var_j = var_i.T
+            r = cov / np.sqrt(var_i * var_j)
+        r[(self.n < 2) | (var_i <= 0) | (var_j <= 0)] = np.nan
+        return np.clip(r, -1.0, 1.0)
+
+
+def frame_comoments(df: pd.DataFrame, columns: list, method: str = "pearson", chunk_rows: int = CORRELATION_CHUNK_ROWS) -> CoMoments:
+    """Accumulate co-moments over row blocks so only one block is densified at a time."""
+    if method == "spearman":
+        # Average ranks per column; NaNs stay NaN and drop out pairwise.
+        source = pd.DataFrame({c: df[c].rank(method="average") for c in columns}, index=df.index)
+    elif method == "pearson":
+        # Row slices of the full frame are views; only each block's columns get copied.
+        source = df
+    else:
+        raise ValueError(f"Unknown correlation method: {method}")
+    first = source.iloc[:chunk_rows][columns]
+    comoments = CoMoments(columns, first.mean().fillna(0.0).to_numpy(dtype="float64"))
+    for start in range(0, len(source), chunk_rows):
+        block = source.iloc[start : start + chunk_rows][columns]
+        comoments.update(block.to_numpy(dtype="float64", na_value=np.nan))
+    return comoments
+
+
+def _groups(columns, pairs_i, pairs_j) -> list:
+    parent = list(range(len(columns)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in zip(pairs_i, pairs_j):
+        parent[find(i)] = find(j)
+    groups = {}
+    for i in sorted(set(pairs_i) | set(pairs_j)):
+        groups.setdefault(find(i), []).append(columns[i])
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def correlation_summary(comoments: CoMoments, top_k: int = CORRELATION_TOP_K, duplicate_threshold: float = DUPLICATE_THRESHOLD) -> dict:
+    """Top-k pairs by |r| and groups of near-duplicate columns instead of the dense matrix."""
+    columns = comoments.columns
+    r = comoments.corr()
+    i, j = np.triu_indices(len(columns), k=1)
+    values = r[i, j]
+    valid = ~np.isnan(values)
+    i, j, values = i[valid], j[valid], values[valid]
+    strength = np.abs(values)
+
+    k = min(top_k, len(values))
+    top = np.argpartition(-strength, k - 1)[:k] if k else np.array([], dtype=int)
+    top = top[np.argsort(-strength[top], kind="stable")]
+    dup = strength >= duplicate_threshold
+
+    undefined = [c for c, v in zip(columns, np.diag(r)) if np.isnan(v)]
+    return {
+        "n_columns": len(columns),
+        "n_pairs": int(len(columns) * (len(columns) - 1) // 2),
+        "top_pairs": [
+            {
+                "feature_a": columns[i[t]],
+                "feature_b": columns[j[t]],
+                "r": float(values[t]),
+                "n": int(comoments.n[i[t], j[t]]),
+            }
+            for t in top
+        ],
+        "near_duplicate_groups": _groups(columns, i[dup].tolist(), j[dup].tolist()),
+        "duplicate_threshold": duplicate_threshold,
+        "undefined_columns": undefined,
+    }
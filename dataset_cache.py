@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from loading import COMPACT_DTYPES, compact_dtypes, parse_csv
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # cache is a no-op without pyarrow
+    feather = None
+
+CACHE_DIR = os.getenv("EDA_CACHE_DIR", ".eda_cache")
+CACHE_MAX_MB = float(os.getenv("EDA_CACHE_MAX_MB", "10240"))
+CACHE_ENABLED = os.getenv("EDA_CACHE_ENABLED", "1") != "0"
+
+HASH_BLOCK_BYTES = 1024 * 1024
+# Unindexed cache files younger than this are left alone; their writer may not have indexed them yet.
+ORPHAN_GRACE_SECONDS = 3600
+
+
+def file_digest(file_path: str) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        while block := f.read(HASH_BLOCK_BYTES):
+            h.update(block)
+    return h.hexdigest()
+
+
+class DatasetCache:
+    """Parsed CSVs stored as uncompressed Arrow/Feather files keyed by content hash.
+
+    Feather files are memory-mapped on read, so a hit costs roughly the
+    Arrow -> pandas conversion instead of a CSV parse. A (path, size, mtime)
+    fingerprint avoids rehashing files that have not changed since the last
+    run. Entries are evicted least-recently-used once the total exceeds
+    max_bytes.
+
+    The index is a SQLite database shared by every process using the cache
+    directory (batch workers, API workers), so entries written by one are
+    seen, counted and evicted by the others. The cache is best-effort: index
+    or file errors fall back to parsing the CSV.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = int(CACHE_MAX_MB * 1024 * 1024)):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = CACHE_ENABLED and feather is not None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(cache_dir, "index.sqlite")
+        self._conn = None
+        if self.enabled:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                self._conn = self._connect()
+            except (OSError, sqlite3.DatabaseError):
+                # A damaged or unwritable index: start a fresh one, or run without the cache.
+                try:
+                    os.remove(self._index_path)
+                    self._conn = self._connect()
+                except (OSError, sqlite3.DatabaseError):
+                    self.enabled = False
+            if self.enabled:
+                self._sweep()
+
+    def _connect(self):
+        conn = sqlite3.connect(self._index_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                memory TEXT
+            )"""
+        )
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS paths (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                key TEXT NOT NULL
+            )"""
+        )
+        conn.commit()
+        return conn
+
+    def _sweep(self):
+        """Delete .feather files the index does not know (crashed writers, an older index format)."""
+        with self._lock:
+            known = {row[0] for row in self._conn.execute("SELECT key FROM entries")}
+        cutoff = time.time() - ORPHAN_GRACE_SECONDS
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            key, ext = os.path.splitext(name)
+            orphan = (ext == ".feather" and key not in known) or name.endswith(".tmp")
+            try:
+                # The grace period leaves files another process is still writing or registering alone.
+                if orphan and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _execute(self, sql: str, params=()) -> list:
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+                self._conn.commit()
+                return rows
+        except sqlite3.Error:
+            return []
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.feather")
+
+    def content_key(self, file_path: str) -> str:
+        st = os.stat(file_path)
+        abs_path = os.path.abspath(file_path)
+        known = self._execute("SELECT size, mtime_ns, key FROM paths WHERE path = ?", (abs_path,))
+        if known and known[0][0] == st.st_size and known[0][1] == st.st_mtime_ns:
+            return known[0][2]
+        key = file_digest(file_path)
+        self._execute("INSERT OR REPLACE INTO paths VALUES (?, ?, ?, ?)", (abs_path, st.st_size, st.st_mtime_ns, key))
+        return key
+
+    def register(self, file_path: str, key: str):
+        """Record a digest computed elsewhere (e.g. while receiving an upload) so it is not rehashed."""
+        if not self.enabled:
+            return
+        st = os.stat(file_path)
+        self._execute(
+            "INSERT OR REPLACE INTO paths VALUES (?, ?, ?, ?)",
+            (os.path.abspath(file_path), st.st_size, st.st_mtime_ns, key),
+        )
+
+    def read_csv(self, file_path: str, compact: bool = COMPACT_DTYPES, **read_csv_kwargs) -> pd.DataFrame:
+        """Parsed CSV, from the cache when possible.
+
+        With `compact`, dtypes are shrunk by loading.compact_dtypes (and
+        cached that way); its memory report is in df.attrs["memory"].
+        """
+        if not self.enabled:
+            df = parse_csv(file_path, arrow_strings=compact, **read_csv_kwargs)
+            if compact:
+                df.attrs["memory"] = compact_dtypes(df)
+            return df
+
+        key = self.content_key(file_path)
+        if read_csv_kwargs:
+            key += "-" + hashlib.blake2b(
+                json.dumps(read_csv_kwargs, sort_keys=True, default=str).encode(), digest_size=8
+            ).hexdigest()
+        if compact:
+            key += "-compact"
+        path = self._entry_path(key)
+
+        entry = self._execute("SELECT memory FROM entries WHERE key = ?", (key,))
+        if entry:
+            try:
+                table = feather.read_table(path, memory_map=True)
+            except (OSError, pa.ArrowInvalid):
+                # Evicted by another process since the lookup, or a damaged file.
+                table = None
+            if table is not None:
+                # Arrow-backed text columns would otherwise come back as Python-object strings.
+                types_mapper = {pa.string(): pd.StringDtype("pyarrow"), pa.large_string(): pd.StringDtype("pyarrow")}.get
+                df = table.to_pandas(types_mapper=types_mapper if compact else None)
+                self._execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+                with self._lock:
+                    self.hits += 1
+                if entry[0][0] is not None:
+                    df.attrs["memory"] = json.loads(entry[0][0])
+                return df
+
+        df = parse_csv(file_path, arrow_strings=compact, **read_csv_kwargs)
+        if compact:
+            df.attrs["memory"] = compact_dtypes(df)
+        with self._lock:
+            self.misses += 1
+        self._put(key, df)
+        return df
+
+    def _put(self, key: str, df: pd.DataFrame):
+        path = self._entry_path(key)
+        # Unique per writer: two processes may cache the same dataset at once.
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            feather.write_feather(df, tmp, compression="uncompressed")
+            os.replace(tmp, path)
+            size = os.path.getsize(path)
+        except Exception:
+            # Mixed-type object columns etc. cannot always be written as Arrow; just skip caching.
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        memory = df.attrs.get("memory")
+        try:
+            with self._lock:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                        (key, size, time.time(), json.dumps(memory) if memory is not None else None),
+                    )
+                    self._evict()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total > self.max_bytes:
+            for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                try:
+                    os.remove(self._entry_path(key))
+                except OSError:
+                    pass
+        self._conn.execute(
+            "DELETE FROM paths WHERE key NOT IN (SELECT substr(key, 1, 40) FROM entries)"
+        )
+
+    def stats(self) -> dict:
+        entries, size = (self._execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries") or [(0, 0)])[0] if self.enabled else (0, 0)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,281 @@
+import os
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+DUPLICATE_EXAMPLE_GROUPS = int(os.getenv("EDA_DUPLICATE_EXAMPLE_GROUPS", "10"))
+DUPLICATE_GROUP_SIZE = int(os.getenv("EDA_DUPLICATE_GROUP_SIZE", "5"))
+# Row hashes held in memory before DuplicateIndex spills them to disk (16 bytes each).
+DUPLICATE_MEMORY_ROWS = int(os.getenv("EDA_DUPLICATE_MEMORY_ROWS", "1000000"))
+# Spilled hashes are split into 2**bits files by their high bits; each is processed on its own.
+DUPLICATE_PARTITION_BITS = int(os.getenv("EDA_DUPLICATE_PARTITION_BITS", "6"))
+SPILL_DIR = os.getenv("EDA_SPILL_DIR") or None
+# In-memory frames are hashed and verified this many rows at a time, so casts stay block-sized.
+DUPLICATE_BLOCK_ROWS = int(os.getenv("EDA_DUPLICATE_BLOCK_ROWS", "65536"))
+
+_RECORD = np.dtype([("hash", "<u8"), ("pos", "<i8")])
+
+
+def row_hashes(chunk: pd.DataFrame) -> np.ndarray:
+    """64-bit hash of every row. Numbers are hashed as float64 so int and float chunks agree."""
+    cast = {
+        c: "float64"
+        for c in chunk.columns
+        if is_numeric_dtype(chunk[c].dtype) and not is_bool_dtype(chunk[c].dtype) and chunk[c].dtype != "float64"
+    }
+    if len(cast) == chunk.shape[1]:
+        # One cast per dtype block instead of one per column.
+        chunk = chunk.astype("float64")
+    elif cast:
+        chunk = chunk.astype(cast)
+    return pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+
+def exact_row_ids(frame: pd.DataFrame) -> np.ndarray:
+    """Group id per row such that rows share an id iff every value is equal (NaN == NaN)."""
+    ids = np.zeros(len(frame), dtype=np.int64)
+    n_ids = 1
+    for c in frame.columns:
+        codes, uniques = pd.factorize(frame[c], use_na_sentinel=False)
+        if n_ids * len(uniques) >= 2**63:
+            ids, labels = pd.factorize(ids)
+            n_ids = len(labels)
+        ids = ids * len(uniques) + codes
+        n_ids *= max(len(uniques), 1)
+    return pd.factorize(ids)[0]
+
+class DuplicateIndex:
+    """Row hashes collected chunk by chunk, then verified against the actual rows.
+
+    Only the 8-byte hash and position of each row are kept between passes.
+    Past `memory_rows` rows they are spilled to disk, partitioned by the
+    hash's high bits, and candidates are found one partition at a time, so
+    memory follows the partition size rather than the row count. Rows
+    whose hash occurs more than once are candidates; verify() re-reads just
+    those rows and compares values exactly, so a hash collision can never
+    be reported as a duplicate. A row counts as a duplicate when an
+    identical row appears earlier (same as DataFrame.duplicated()).
+    """
+
+    def __init__(self, memory_rows: int = DUPLICATE_MEMORY_ROWS, partition_bits: int = DUPLICATE_PARTITION_BITS):
+        self.n_rows = 0
+        self.memory_rows = memory_rows
+        self.partition_bits = partition_bits
+        self._buffer = []
+        self._buffered = 0
+        self._spill_dir = None
+        self._cleanup = None
+
+    def update(self, chunk: pd.DataFrame):
+        records = np.empty(len(chunk), dtype=_RECORD)
+        records["hash"] = row_hashes(chunk)
+        records["pos"] = np.arange(self.n_rows, self.n_rows + len(chunk))
+        self.n_rows += len(chunk)
+        self._add(records)
+
+    def merge(self, other: "DuplicateIndex") -> "DuplicateIndex":
+        for records in other._partitions():
+            records = records.copy()
+            records["pos"] += self.n_rows
+            self._add(records)
+        self.n_rows += other.n_rows
+        return self
+
+    def _add(self, records: np.ndarray):
+        self._buffer.append(records)
+        self._buffered += len(records)
+        if self._buffered > self.memory_rows:
+            self._spill()
+
+    def _partition_path(self, k: int) -> str:
+        return os.path.join(self._spill_dir, f"{k:05d}.bin")
+
+    def _spill(self):
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="eda-duplicates-", dir=SPILL_DIR)
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+        records = np.concatenate(self._buffer)
+        self._buffer, self._buffered = [], 0
+        parts = (records["hash"] >> np.uint64(64 - self.partition_bits)).astype(np.int64)
+        order = np.argsort(parts, kind="stable")
+        records = records[order]
+        bounds = np.searchsorted(parts[order], np.arange((1 << self.partition_bits) + 1))
+        for k in np.flatnonzero(np.diff(bounds)):
+            with open(self._partition_path(k), "ab") as f:
+                records[bounds[k] : bounds[k + 1]].tofile(f)
+
+    def _partitions(self):
+        """(hash, pos) records one partition at a time; everything at once if nothing was spilled."""
+        if self._spill_dir is None:
+            yield np.concatenate(self._buffer) if self._buffer else np.empty(0, dtype=_RECORD)
+            return
+        if self._buffer:
+            self._spill()
+        for k in range(1 << self.partition_bits):
+            if os.path.exists(self._partition_path(k)):
+                yield np.fromfile(self._partition_path(k), dtype=_RECORD)
+
+    def __getstate__(self):
+        # Spill files belong to this process; a pickled index carries its records in memory.
+        state = self.__dict__.copy()
+        if self._spill_dir is not None:
+            state["_buffer"] = list(self._partitions())
+            state["_buffered"] = sum(len(r) for r in state["_buffer"])
+        state["_spill_dir"] = state["_cleanup"] = None
+        return state
+
+    def hashes(self) -> np.ndarray:
+        """Every row's hash in row order (materialized in memory)."""
+        hashes = np.empty(self.n_rows, dtype=np.uint64)
+        for records in self._partitions():
+            hashes[records["pos"]] = records["hash"]
+        return hashes
+
+    def _candidates(self) -> np.ndarray:
+        found = []
+        for records in self._partitions():
+            order = np.argsort(records["hash"], kind="stable")
+            sorted_hashes = records["hash"][order]
+            equal = sorted_hashes[1:] == sorted_hashes[:-1]
+            shared = np.zeros(len(records), dtype=bool)
+            shared[1:] |= equal
+            shared[:-1] |= equal
+            found.append(records[order[shared]])
+        found = np.concatenate(found) if found else np.empty(0, dtype=_RECORD)
+        return found[np.argsort(found["pos"], kind="stable")]
+
+    def candidates(self) -> np.ndarray:
+        """Sorted positions of rows whose hash is shared with at least one other row."""
+        return self._candidates()["pos"]
+
+    def verify(self, chunks, example_groups: int = DUPLICATE_EXAMPLE_GROUPS, group_size: int = DUPLICATE_GROUP_SIZE) -> dict:
+        """Second pass over the same rows, in the same order, as were passed to update()."""
+        found = self._candidates()
+        candidates, candidate_hashes = found["pos"], found["hash"]
+        reps, rep_pos, rep_hash = None, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint64)
+        rep_matched = np.empty(0, dtype=bool)
+        count = 0
+        examples = {}
+        offset = 0
+
+        for chunk in chunks:
+            lo, hi = np.searchsorted(candidates, [offset, offset + len(chunk)])
+            pos, pos_hash = candidates[lo:hi], candidate_hashes[lo:hi]
+            offset += len(chunk)
+            if not len(pos):
+                continue
+            sub = chunk.iloc[pos - (offset - len(chunk))].reset_index(drop=True)
+            # Only earlier rows with one of these hashes can be equal to them.
+            relevant = np.flatnonzero(np.isin(rep_hash, pos_hash))
+            frame = sub if reps is None else pd.concat([reps.iloc[relevant], sub], ignore_index=True)
+            n_prev = len(relevant)
+
+            ids = exact_row_ids(frame)
+            _, first = np.unique(ids, return_index=True)
+            first_of = first[ids]
+            new = first_of[n_prev:] == np.arange(n_prev, len(frame))
+            frame_rep = np.concatenate([relevant, len(rep_pos) + np.cumsum(new) - 1])
+            frame_pos = np.concatenate([rep_pos[relevant], pos])
+
+            reps = sub[new] if reps is None else pd.concat([reps, sub[new]], ignore_index=True)
+            rep_pos = np.concatenate([rep_pos, pos[new]])
+            rep_hash = np.concatenate([rep_hash, pos_hash[new]])
+            rep_matched = np.concatenate([rep_matched, np.zeros(int(new.sum()), dtype=bool)])
+
+            dup = np.flatnonzero(~new) + n_prev
+            count += len(dup)
+            rep_matched[frame_rep[first_of[dup]]] = True
+            origins = frame_pos[first_of[dup]]
+            fresh = [o for o in pd.unique(origins) if o not in examples]
+            for origin in list(examples) + fresh[: example_groups - len(examples)]:
+                group = examples.setdefault(int(origin), [int(origin)])
+                room = group_size - len(group)
+                if room > 0:
+                    group.extend(frame_pos[dup[origins == origin][:room]].tolist())
+
+        return {
+            "count": count,
+            "fraction": count / self.n_rows if self.n_rows else 0.0,
+            "groups": int(rep_matched.sum()),
+            "example_groups": list(examples.values()),
+            "hash_collisions": int((~rep_matched).sum()),
+        }
+
+
+class HashCounts:
+    """Distinct row hashes with their counts and first positions, extended as rows are appended.
+
+    Seeded from a verified result, so it starts exact. Appended rows are
+    matched against every earlier row by hash alone, without re-reading
+    them; once that finds a duplicate the result is marked not exact (a
+    64-bit collision would be miscounted, with odds of about n^2 / 2^65).
+    """
+
+    def __init__(self, hashes: np.ndarray, verified: dict):
+        self.hashes, self.first, self.counts = np.unique(hashes, return_index=True, return_counts=True)
+        self.n_rows = len(hashes)
+        self.count = verified["count"]
+        self.groups = verified["groups"]
+        self.examples = {group[0]: group for group in verified["example_groups"]}
+        self.hash_collisions = verified["hash_collisions"]
+        self.exact = True
+
+    def extend(self, hashes: np.ndarray, example_groups: int = DUPLICATE_EXAMPLE_GROUPS, group_size: int = DUPLICATE_GROUP_SIZE):
+        positions = self.n_rows + np.arange(len(hashes))
+        self.n_rows += len(hashes)
+        uniq, first, inverse, counts = np.unique(hashes, return_index=True, return_inverse=True, return_counts=True)
+        idx = np.searchsorted(self.hashes, uniq)
+        if len(self.hashes):
+            at = np.minimum(idx, len(self.hashes) - 1)
+            seen = self.hashes[at] == uniq
+            prev = np.where(seen, self.counts[at], 0)
+            origin = np.where(seen, self.first[at], positions[first])
+        else:
+            seen, prev, origin = np.zeros(len(uniq), dtype=bool), np.zeros(len(uniq), dtype=np.int64), positions[first]
+
+        # Every appended row is a duplicate except the first occurrence of a hash never seen before.
+        dup = seen[inverse] | (np.arange(len(hashes)) != first[inverse])
+        added = int(dup.sum())
+        self.count += added
+        self.groups += int(((prev < 2) & (prev + counts > 1)).sum())
+        self.exact = self.exact and not added
+
+        origins = origin[inverse[dup]]
+        dup_pos = positions[dup]
+        fresh = [o for o in pd.unique(origins) if o not in self.examples]
+        for o in list(self.examples) + fresh[: example_groups - len(self.examples)]:
+            group = self.examples.setdefault(int(o), [int(o)])
+            room = group_size - len(group)
+            if room > 0:
+                group.extend(dup_pos[origins == o][:room].tolist())
+
+        self.counts[idx[seen]] += counts[seen]
+        self.hashes = np.insert(self.hashes, idx[~seen], uniq[~seen])
+        self.first = np.insert(self.first, idx[~seen], positions[first[~seen]])
+        self.counts = np.insert(self.counts, idx[~seen], counts[~seen])
+
+    def result(self) -> dict:
+        return {
+            "count": self.count,
+            "fraction": self.count / self.n_rows if self.n_rows else 0.0,
+            "groups": self.groups,
+            "example_groups": list(self.examples.values()),
+            "hash_collisions": self.hash_collisions,
+            "exact": self.exact,
+        }
+
+
+def _blocks(df: pd.DataFrame, rows: int = DUPLICATE_BLOCK_ROWS):
+    for start in range(0, len(df), rows):
+        yield df.iloc[start : start + rows]
+
+
+def find_duplicates(df: pd.DataFrame) -> dict:
+    index = DuplicateIndex()
+    for block in _blocks(df):
+        index.update(block)
+    return index.verify(_blocks(df))
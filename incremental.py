@@ -0,0 +1,262 @@
+import copy
+import hashlib
+import io
+import os
+import pickle
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from correlation import CORRELATION_METHODS, correlation_summary, frame_comoments
+from duplicates import HashCounts
+from streaming import (
+    DEFAULT_CHUNK_ROWS,
+    STREAMING_OUTLIER_METHODS,
+    StreamingDataset,
+    StreamingEDA_Tasks,
+    StreamingStats,
+)
+from Tasks import OUTLIER_METHODS, OUTLIER_SAMPLE_SIZE, DuplicateRows, State
+
+INCREMENTAL = os.getenv("EDA_INCREMENTAL", "0").lower() in ("1", "true", "yes")
+STATE_DIR = os.getenv("EDA_STATE_DIR", os.path.join(".eda_cache", "state"))
+# Bytes just before the processed offset that must be unchanged for an append to be trusted.
+TAIL_CHECK_BYTES = 64 * 1024
+STATE_VERSION = 1
+# Standard errors in a sample-based outlier count's bound; ~99%, like the sketch's rank-error bound.
+SAMPLE_ERROR_Z = 2.576
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of an open binary file from its current position up to `end`."""
+
+    def __init__(self, f, end: int):
+        self.f = f
+        self.remaining = end - f.tell()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = self.f.readinto(memoryview(buffer)[: max(0, min(len(buffer), self.remaining))])
+        self.remaining -= n
+        return n
+
+
+def _digest(f, start: int, end: int) -> str:
+    f.seek(start)
+    return hashlib.blake2b(f.read(end - start), digest_size=20).hexdigest()
+
+
+def _last_newline_end(f, size: int, block: int = 1024 * 1024) -> int:
+    """Offset just past the last b"\\n" in the file, or 0 if there is none."""
+    pos = size
+    while pos > 0:
+        start = max(0, pos - block)
+        f.seek(start)
+        i = f.read(pos - start).rfind(b"\n")
+        if i >= 0:
+            return start + i + 1
+        pos = start
+    return 0
+
+
+class IncrementalDataset(StreamingDataset):
+    """A StreamingDataset whose aggregates persist across runs and grow with the file.
+
+    State (StreamingStats plus duplicate-row hash counts) is pickled under
+    `state_dir`, keyed by the file's absolute path, together with the byte
+    offset it covers and digests of the header line and of the bytes just
+    before that offset. On the next run, if both digests still match and
+    the file is at least as long, only the bytes past the offset are parsed
+    and merged in, so the cost follows the size of the append. Anything
+    else (a rewrite, truncation, a different target) rebuilds from scratch.
+
+    Only newline-terminated rows are committed to the state; an unterminated
+    last line is included in this run's statistics but re-read next time.
+    """
+
+    def __init__(self, file_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, state_dir: str = STATE_DIR):
+        super().__init__(file_path, chunk_rows)
+        key = hashlib.blake2b(os.path.abspath(file_path).encode(), digest_size=20).hexdigest()
+        self.state_path = os.path.join(state_dir, key + ".pkl")
+        self.refresh = None
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        return state if state.get("version") == STATE_VERSION else None
+
+    def _save_state(self, state: dict):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp = f"{self.state_path}.{uuid.uuid4().hex}.part"
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.state_path)
+
+    def _read(self, f, start: int, end: int, columns=None, dtype=None):
+        f.seek(start)
+        if start >= end:
+            return
+        source = io.BufferedReader(_ByteRange(f, end))
+        if columns is None:
+            yield from pd.read_csv(source, chunksize=self.chunk_rows)
+        else:
+            yield from pd.read_csv(source, header=None, names=columns, dtype=dtype, chunksize=self.chunk_rows)
+
+    def _append(self, stats: StreamingStats, counts: HashCounts, chunks):
+        for chunk in chunks:
+            stats.update(chunk)
+            counts.extend(stats.duplicates.hashes())
+            # The hashes now live in `counts`; don't keep a second copy of them.
+            stats.duplicates = type(stats.duplicates)()
+
+    def _tail_columns(self, stats: StreamingStats) -> dict:
+        # Without a header row pandas would re-infer types; keep text columns text.
+        return {c: str for c in stats.columns if c not in stats.numeric_columns}
+
+    def stats(self, target_variable=None) -> StreamingStats:
+        if self._stats is not None and self._stats.target_variable == target_variable:
+            return self._stats
+
+        with open(self.file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            header_end = len(f.readline())
+            header_digest = _digest(f, 0, header_end)
+            end = max(_last_newline_end(f, size), header_end)
+
+            state = self._load_state()
+            fresh = (
+                state is None
+                or state["target_variable"] != target_variable
+                or state["header_digest"] != header_digest
+                or state["offset"] > end
+                or state["tail_digest"] != _digest(f, state["tail_start"], state["offset"])
+            )
+            if fresh:
+                stats = StreamingStats(target_variable)
+                for chunk in self._read(f, 0, end):
+                    stats.update(chunk)
+                verified = stats.duplicates.verify(self._read(f, 0, end))
+                counts = HashCounts(stats.duplicates.hashes(), verified)
+                stats.duplicates = type(stats.duplicates)()
+                start = 0
+            else:
+                stats, counts, start = state["stats"], state["duplicates"], state["offset"]
+                previous_rows = stats.n_rows
+                if stats.columns is not None:
+                    self._append(stats, counts, self._read(f, start, end, stats.columns, self._tail_columns(stats)))
+
+            if stats.columns is not None:
+                tail_start = max(header_end, end - TAIL_CHECK_BYTES)
+                self._save_state({
+                    "version": STATE_VERSION,
+                    "file_path": os.path.abspath(self.file_path),
+                    "target_variable": target_variable,
+                    "header_digest": header_digest,
+                    "offset": end,
+                    "tail_start": tail_start,
+                    "tail_digest": _digest(f, tail_start, end),
+                    "stats": stats,
+                    "duplicates": counts,
+                })
+            self.refresh = {
+                "mode": "full" if fresh else "append",
+                "bytes_read": end - start,
+                "rows_added": stats.n_rows - (0 if fresh else previous_rows),
+            }
+
+            if end < size and stats.columns is not None:
+                # An unterminated last line: count it now without committing it to the state.
+                stats, counts = copy.deepcopy(stats), copy.deepcopy(counts)
+                self._append(stats, counts, self._read(f, end, size, stats.columns, self._tail_columns(stats)))
+
+        stats.duplicate_rows = DuplicateRows(**counts.result())
+        self._stats = stats
+        return stats
+
+
+def outlier_count(sketch, lower: float, upper: float, sample_outliers: int, sample_size: int) -> tuple:
+    """(count, error bound, source) for the values outside [lower, upper].
+
+    The sketch's count is within 2 * rank_error * n, which is coarse for
+    rare outliers; the sample's outlier rate scaled to n has a binomial
+    error instead. Whichever bound is tighter is used.
+    """
+    n = sketch.n
+    if sketch.exact:
+        return sketch.count_outside(lower, upper), 0, "sketch"
+    if sample_size >= n:
+        return sample_outliers, 0, "sample"
+    sketch_error = 2 * sketch.rank_error * n
+    # The add-one rate keeps the bound above zero when the sample has no outliers.
+    p = (sample_outliers + 1) / (sample_size + 2)
+    sample_error = SAMPLE_ERROR_Z * n * np.sqrt(p * (1 - p) / sample_size * (1 - sample_size / n))
+    if sample_error < sketch_error:
+        return int(round(sample_outliers * n / sample_size)), int(np.ceil(sample_error)), "sample"
+    return sketch.count_outside(lower, upper), int(np.ceil(sketch_error)), "sketch"
+
+
+class IncrementalEDA_Tasks(StreamingEDA_Tasks):
+    """StreamingEDA_Tasks that never re-read the file: every executor works from the persisted aggregates.
+
+    Rank correlations and feature ranking use the reservoir sample, and
+    outlier counts come from the quantile sketches or the sample (see
+    outlier_count), so those are marked approximate once they stop being
+    exact.
+    """
+
+    def Speculative_profiling(self, df: IncrementalDataset, cache: dict) -> None:
+        # Saved state is per target, so building it before the target is known would force a rebuild.
+        pass
+
+    def EDA_executer_correlation(self, df: IncrementalDataset, state: State, cache: dict | None = None) -> dict:
+        target_variable = state["Domain_expert"]["target_variable"]
+        stats = df.stats(target_variable)
+        cols = [c for c in stats.numeric_columns if c != target_variable]
+        sample = stats.sample[cols].apply(pd.to_numeric, errors="coerce")
+        result = {}
+        for method in CORRELATION_METHODS:
+            if method == "pearson":
+                result[method] = correlation_summary(stats.comoments.subset(cols))
+            elif method == "spearman":
+                result[method] = correlation_summary(frame_comoments(sample, cols, method))
+                result[method]["exact"] = len(sample) == stats.n_rows
+                result[method]["sample_rows"] = len(sample)
+            else:
+                raise ValueError(f"Unknown correlation method: {method}")
+        return result
+
+    def EDA_executer_outlier_detection(self, df: IncrementalDataset, state: State, cache: dict | None = None) -> dict:
+        target_variable = state["Domain_expert"]["target_variable"]
+        stats = df.stats(target_variable)
+        cols = [c for c in stats.numeric_columns if c != target_variable]
+        sample = stats.sample[cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        order = np.argsort(stats.sample_rows, kind="stable")
+        sample, rows = sample[order], stats.sample_rows[order]
+        results = {}
+        for method in (m for m in OUTLIER_METHODS if m in STREAMING_OUTLIER_METHODS):
+            lower, upper = stats.outlier_bounds(cols, method)
+            mask = (sample < lower) | (sample > upper)
+            results[method] = {}
+            for j, col in enumerate(cols):
+                m = stats.moments[col]
+                count, error, source = outlier_count(
+                    m.sketch, lower[j], upper[j], int(mask[:, j].sum()), int((~np.isnan(sample[:, j])).sum())
+                )
+                results[method][col] = {
+                    "count": count,
+                    "count_error": error,
+                    "count_source": source,
+                    "fraction": count / m.count if m.count else 0.0,
+                    "lower_bound": float(lower[j]),
+                    "upper_bound": float(upper[j]),
+                    # Row positions of sampled outliers; the full set would need another pass.
+                    "sample_indices": rows[mask[:, j]][:OUTLIER_SAMPLE_SIZE].tolist(),
+                    "exact": error == 0,
+                }
+        return results
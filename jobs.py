@@ -0,0 +1,161 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+
+JOB_WORKERS = int(os.getenv("EDA_JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.getenv("EDA_JOB_QUEUE_SIZE", "16"))
+JOB_TTL_SECONDS = float(os.getenv("EDA_JOB_TTL_SECONDS", "3600"))
+# Finished jobs (and their results) kept at most; the oldest are dropped first.
+JOB_MAX_RETAINED = int(os.getenv("EDA_JOB_MAX_RETAINED", "256"))
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, job_id: str, file_path: str):
+        self.job_id = job_id
+        self.file_path = file_path
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.future: Future | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "file_path": self.file_path,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Runs analyses on a fixed pool of worker threads behind a bounded queue.
+
+    At most `workers` jobs run at once and at most `queue_size` more wait;
+    submit() raises QueueFullError beyond that so callers can shed load
+    instead of piling up latency. Finished jobs are kept for `ttl` seconds,
+    and at most `max_retained` of them at a time.
+    """
+
+    def __init__(
+        self,
+        run_fn,
+        stream_fn=None,
+        workers: int = JOB_WORKERS,
+        queue_size: int = JOB_QUEUE_SIZE,
+        ttl: float = JOB_TTL_SECONDS,
+        max_retained: int = JOB_MAX_RETAINED,
+    ):
+        self.run_fn = run_fn
+        self.stream_fn = stream_fn
+        self.workers = workers
+        self.queue_size = queue_size
+        self.ttl = ttl
+        self.max_retained = max_retained
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eda-job")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, file_path: str, on_event=None, **kwargs) -> Job:
+        """Queue an analysis of `file_path`.
+
+        With `on_event`, the job runs `stream_fn` instead of `run_fn` and
+        calls on_event(job, event) from the worker thread for each progress
+        event, then on_event(job, None) once the job has finished; the job's
+        result is set before the final event is passed on.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(
+                f"Job queue is full ({self.workers} running, {self.queue_size} queued)"
+            )
+        self._expire()
+        job = Job(uuid.uuid4().hex, file_path)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        try:
+            job.future = self._executor.submit(self._run, job, kwargs, on_event)
+        except Exception:
+            self._slots.release()
+            raise
+        return job
+
+    def _finish(self, job: Job, result):
+        if isinstance(result, dict) and result.get("error"):
+            job.status, job.error = "failed", result["error"]
+        else:
+            job.status = "done"
+        job.result = result
+        job.finished_at = time.time()
+
+    def _stream(self, job: Job, kwargs: dict, on_event):
+        result = None
+        for event in self.stream_fn(file_path=job.file_path, **kwargs):
+            if event["event"] == "result":
+                result = event["result"] or {}
+                self._finish(job, result)
+            elif event["event"] == "error":
+                result = {"error": event["error"]}
+                self._finish(job, result)
+            on_event(job, event)
+        return result if result is not None else {"error": "Analysis ended without a result"}
+
+    def _run(self, job: Job, kwargs: dict, on_event=None):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            if on_event is None:
+                result = self.run_fn(file_path=job.file_path, **kwargs)
+            else:
+                result = self._stream(job, kwargs, on_event)
+            if job.finished_at is None:
+                self._finish(job, result)
+            return result
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+            job.finished_at = time.time()
+            if on_event is not None:
+                on_event(job, {"event": "error", "error": str(e)})
+            raise
+        finally:
+            self._slots.release()
+            if on_event is not None:
+                on_event(job, None)
+
+    def get(self, job_id: str) -> Job | None:
+        self._expire()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            finished = sorted(
+                (j for j in self._jobs.values() if j.finished_at is not None), key=lambda j: j.finished_at
+            )
+            excess = max(0, len(finished) - self.max_retained)
+            for n, job in enumerate(finished):
+                if n < excess or job.finished_at < cutoff:
+                    del self._jobs[job.job_id]
+
+    def stats(self) -> dict:
+        self._expire()
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self.workers, "queue_size": self.queue_size, "jobs": counts}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,176 @@
+import hashlib
+import itertools
+import json
+import os
+import random
+import threading
+import time
+
+from langchain_core.messages import AIMessage
+
+# "groq" talks to the API; "record" does too and appends every response to EDA_LLM_RECORDINGS;
+# "replay" answers from that file without any network access.
+LLM_BACKEND = os.getenv("EDA_LLM_BACKEND", "groq").lower()
+LLM_MODEL = os.getenv("EDA_LLM_MODEL", "llama-3.1-8b-instant")
+LLM_RECORDINGS = os.getenv("EDA_LLM_RECORDINGS", os.path.join(".eda_cache", "llm_recordings.jsonl"))
+# Replay latency: "recorded" sleeps as long as the original call took, a number sleeps that many seconds.
+REPLAY_LATENCY = os.getenv("EDA_REPLAY_LATENCY", "recorded")
+REPLAY_JITTER = float(os.getenv("EDA_REPLAY_JITTER", "0"))
+
+
+def _schema_name(schema) -> str:
+    return "text" if schema is None else schema.__name__
+
+
+def _prompt_key(schema, prompt) -> str:
+    return hashlib.sha256(f"{_schema_name(schema)}\0{prompt}".encode()).hexdigest()
+
+
+class _Structured:
+    def __init__(self, backend, schema, runnable=None):
+        self.backend = backend
+        self.schema = schema
+        self.runnable = runnable
+
+    def invoke(self, prompt, *args, **kwargs):
+        return self.backend._invoke(self.schema, prompt, self.runnable, *args, **kwargs)
+
+
+class RecordingLLM:
+    """Passes calls through to the real model and appends each response to a JSONL file."""
+
+    def __init__(self, llm, path: str = LLM_RECORDINGS):
+        self.llm = llm
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.llm, "model_name", None) or type(self.llm).__name__
+
+    def with_structured_output(self, schema, **options):
+        return _Structured(self, schema, self.llm.with_structured_output(schema, **options))
+
+    def invoke(self, prompt, *args, **kwargs):
+        return self._invoke(None, prompt, self.llm, *args, **kwargs)
+
+    def _invoke(self, schema, prompt, runnable, *args, **kwargs):
+        start = time.perf_counter()
+        result = runnable.invoke(prompt, *args, **kwargs)
+        latency = time.perf_counter() - start
+        if schema is None:
+            response = result.content
+        elif hasattr(result, "model_dump"):
+            response = result.model_dump()
+        else:
+            return result
+        line = json.dumps({
+            "schema": _schema_name(schema),
+            "key": _prompt_key(schema, prompt),
+            "latency_s": latency,
+            "response": response,
+        }, default=str)
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+
+class ReplayLLM:
+    """Answers from recorded responses with synthetic latency; never touches the network.
+
+    A prompt recorded verbatim gets its own response. Any other prompt gets
+    the recorded responses for the same output schema in rotation, so a
+    recording made on one dataset can drive load against others.
+    """
+
+    model_name = "replay"
+
+    def __init__(self, path: str = LLM_RECORDINGS, latency: str = REPLAY_LATENCY, jitter: float = REPLAY_JITTER):
+        self.path = path
+        self.latency = latency
+        self.jitter = jitter
+        self.exact_hits = 0
+        self.fallbacks = 0
+        self._by_key = {}
+        by_schema = {}
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._by_key[entry["key"]] = entry
+                    by_schema.setdefault(entry["schema"], []).append(entry)
+        self._rotation = {name: itertools.cycle(entries) for name, entries in by_schema.items()}
+        self._lock = threading.Lock()
+
+    def with_structured_output(self, schema, **options):
+        return _Structured(self, schema)
+
+    def invoke(self, prompt, *args, **kwargs):
+        return self._invoke(None, prompt, None)
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _invoke(self, schema, prompt, runnable, *args, **kwargs):
+        name = _schema_name(schema)
+        with self._lock:
+            entry = self._by_key.get(_prompt_key(schema, prompt))
+            if entry is not None:
+                self.exact_hits += 1
+            elif name in self._rotation:
+                entry = next(self._rotation[name])
+                self.fallbacks += 1
+            else:
+                raise KeyError(f"No recorded {name} responses in {self.path}")
+
+        delay = entry["latency_s"] if self.latency == "recorded" else float(self.latency)
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, delay))
+
+        if schema is None:
+            return AIMessage(content=entry["response"])
+        return schema.model_validate(entry["response"])
+
+    def stats(self) -> dict:
+        return {"exact_hits": self.exact_hits, "fallbacks": self.fallbacks}
+
+
+class ConcurrencyLimitedLLM:
+    """Holds `semaphore` for the duration of every call; the semaphore may be shared across processes."""
+
+    def __init__(self, llm, semaphore):
+        self.llm = llm
+        self.semaphore = semaphore
+
+    def with_structured_output(self, schema, **options):
+        return _Structured(self, schema, self.llm.with_structured_output(schema, **options))
+
+    def invoke(self, prompt, *args, **kwargs):
+        return self._invoke(None, prompt, self.llm, *args, **kwargs)
+
+    def _invoke(self, schema, prompt, runnable, *args, **kwargs):
+        with self.semaphore:
+            return runnable.invoke(prompt, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+
+def make_chat_model():
+    """The chat model selected by EDA_LLM_BACKEND."""
+    if LLM_BACKEND == "replay":
+        return ReplayLLM()
+    from langchain_groq import ChatGroq
+
+    llm = ChatGroq(api_key=os.getenv("GROQ_API_KEY"), model=LLM_MODEL)
+    if LLM_BACKEND == "record":
+        return RecordingLLM(llm)
+    if LLM_BACKEND != "groq":
+        raise ValueError(f"Unknown EDA_LLM_BACKEND: {LLM_BACKEND}")
+    return llm
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from langchain_core.messages import AIMessage
+
+from metrics import record_llm_call
+from prompt_compaction import estimate_tokens
+
+LLM_CACHE_PATH = os.getenv("EDA_LLM_CACHE_PATH", os.path.join(".eda_cache", "llm_cache.sqlite"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("EDA_LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_MB = float(os.getenv("EDA_LLM_CACHE_MAX_MB", "256"))
+LLM_CACHE_ENABLED = os.getenv("EDA_LLM_CACHE_ENABLED", "1") != "0"
+
+
+def _schema_id(schema) -> str:
+    if schema is None:
+        return "text"
+    return f"{schema.__name__}:{json.dumps(schema.model_json_schema(), sort_keys=True)}"
+
+
+class LLMCache:
+    """SQLite store of LLM responses keyed by (model, output schema, prompt).
+
+    Entries older than ttl are treated as misses; once the stored payloads
+    exceed max_bytes the least recently used rows are deleted. Each entry
+    remembers how long the original call took so hits can report time saved.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL_SECONDS, max_bytes: int = int(LLM_CACHE_MAX_MB * 1024 * 1024)):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.time_saved_s = 0.0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                latency_s REAL NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, schema, prompt: str, options: dict | None = None) -> str:
+        h = hashlib.sha256()
+        for part in (model, _schema_id(schema), json.dumps(options or {}, sort_keys=True, default=str), prompt):
+            h.update(part.encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, latency_s, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[2] < now - self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            self.time_saved_s += row[1]
+            return json.loads(row[0])
+
+    def put(self, key: str, value, latency_s: float):
+        payload = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, len(payload), latency_s, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "time_saved_s": self.time_saved_s,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class _CachedStructured:
+    def __init__(self, parent: "CachedLLM", schema, options: dict):
+        self.parent = parent
+        self.schema = schema
+        self.options = options
+        self.runnable = parent.llm.with_structured_output(schema, **options)
+
+    def invoke(self, prompt, *args, **kwargs):
+        return self.parent._cached(
+            self.schema,
+            self.options,
+            prompt,
+            lambda: self.runnable.invoke(prompt, *args, **kwargs),
+        )
+
+
+class CachedLLM:
+    """Drop-in wrapper for the chat model used by EDA_Agents, with a persistent response cache."""
+
+    def __init__(self, llm, cache: LLMCache | None = None, enabled: bool = LLM_CACHE_ENABLED):
+        self.llm = llm
+        self.cache = cache if cache is not None else (LLMCache() if enabled else None)
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.llm, "model_name", None) or getattr(self.llm, "model", "") or type(self.llm).__name__
+
+    def with_structured_output(self, schema, **options):
+        return _CachedStructured(self, schema, options)
+
+    def invoke(self, prompt, *args, **kwargs):
+        return self._cached(None, {}, prompt, lambda: self.llm.invoke(prompt, *args, **kwargs))
+
+    def _cached(self, schema, options, prompt, call):
+        start = time.perf_counter()
+        if self.cache is None or not isinstance(prompt, str):
+            result = call()
+            self._record(prompt, result, time.perf_counter() - start, "off")
+            return result
+        key = LLMCache.make_key(self.model_name, schema, prompt, options)
+        hit = self.cache.get(key)
+        if hit is not None:
+            record_llm_call(time.perf_counter() - start, "hit", 0, 0)
+            return AIMessage(content=hit) if schema is None else schema.model_validate(hit)
+
+        start = time.perf_counter()
+        result = call()
+        latency = time.perf_counter() - start
+        self._record(prompt, result, latency, "miss")
+        if schema is None:
+            self.cache.put(key, result.content, latency)
+        elif hasattr(result, "model_dump"):
+            self.cache.put(key, result.model_dump(), latency)
+        return result
+
+    @staticmethod
+    def _record(prompt, result, latency: float, cache: str):
+        # Structured output drops the provider's usage metadata, so fall back to the estimate.
+        usage = getattr(result, "usage_metadata", None) or {}
+        if isinstance(result, AIMessage) or not hasattr(result, "model_dump"):
+            completion = str(getattr(result, "content", result))
+        else:
+            completion = json.dumps(result.model_dump(), default=str)
+        record_llm_call(
+            latency,
+            cache,
+            usage.get("input_tokens") or estimate_tokens(str(prompt)),
+            usage.get("output_tokens") or estimate_tokens(completion),
+        )
+
+    def stats(self) -> dict:
+        return self.cache.stats() if self.cache is not None else {"enabled": False}
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
@@ -0,0 +1,113 @@
+import os
+
+import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_integer_dtype, is_object_dtype
+
+try:
+    import pyarrow
+    import pyarrow.csv
+except ImportError:  # falls back to the C parser and object strings
+    pyarrow = None
+
+COMPACT_DTYPES = os.getenv("EDA_COMPACT_DTYPES", "1") != "0"
+CSV_ENGINE = os.getenv("EDA_CSV_ENGINE", "pyarrow" if pyarrow is not None else "c")
+# Text columns with at most this many distinct values per row become categoricals.
+CATEGORY_MAX_RATIO = float(os.getenv("EDA_CATEGORY_MAX_RATIO", "0.5"))
+
+
+# pandas' default na_values, so both parsers read the same cells as missing.
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+def _read_arrow(file_path: str) -> pd.DataFrame:
+    # pd.read_csv(engine="pyarrow") with text kept in Arrow memory instead of Python strings.
+    convert_options = pyarrow.csv.ConvertOptions(null_values=NA_VALUES, strings_can_be_null=True)
+    try:
+        # Batch by batch: about half the peak memory of read_csv, which holds every parse buffer at once.
+        reader = pyarrow.csv.open_csv(file_path, convert_options=convert_options)
+        table = pyarrow.Table.from_batches(list(reader), schema=reader.schema)
+    except pyarrow.ArrowInvalid:
+        # Types are inferred from the first block; a later value that doesn't fit needs the whole file.
+        table = pyarrow.csv.read_csv(file_path, convert_options=convert_options)
+    for i, field in enumerate(table.schema):
+        if pyarrow.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pyarrow.float64()))
+    text = pd.StringDtype("pyarrow")
+    return table.to_pandas(types_mapper={pyarrow.string(): text, pyarrow.large_string(): text}.get)
+
+
+def parse_csv(file_path: str, arrow_strings: bool = False, **read_csv_kwargs) -> pd.DataFrame:
+    """pd.read_csv with the multithreaded pyarrow parser when it can handle the call.
+
+    With `arrow_strings`, text columns are parsed straight into Arrow-backed
+    strings rather than Python-object strings (compact_dtypes shrinks them
+    from there); the C parser fallback still returns object columns.
+    """
+    if CSV_ENGINE == "pyarrow" and pyarrow is not None and not read_csv_kwargs:
+        try:
+            if arrow_strings:
+                return _read_arrow(file_path)
+            return pd.read_csv(file_path, engine="pyarrow")
+        except Exception:
+            # Ragged rows and other inputs the C parser tolerates.
+            pass
+    return pd.read_csv(file_path, **read_csv_kwargs)
+
+
+# Deep memory of object columns is measured on a strided sample of about this many rows.
+MEMORY_SAMPLE_ROWS = 10000
+
+
+def _memory(series: pd.Series) -> int:
+    if not is_object_dtype(series.dtype) or len(series) <= MEMORY_SAMPLE_ROWS:
+        return int(series.memory_usage(index=False, deep=True))
+    step = len(series) // MEMORY_SAMPLE_ROWS
+    sample = series.iloc[::step]
+    return int(sample.memory_usage(index=False, deep=True) * len(series) / len(sample))
+
+
+def _compact_series(series: pd.Series) -> pd.Series:
+    if is_integer_dtype(series.dtype) and not is_bool_dtype(series.dtype):
+        return pd.to_numeric(series, downcast="integer")
+    arrow_text = isinstance(series.dtype, pd.StringDtype) and series.dtype.storage == "pyarrow"
+    if arrow_text or (is_object_dtype(series.dtype) and infer_dtype(series, skipna=True) == "string"):
+        codes, uniques = pd.factorize(series)
+        if len(uniques) <= CATEGORY_MAX_RATIO * len(series):
+            # Object categories, as the C parser path produces; only the distinct values are converted.
+            categories = pd.Index(uniques.astype(object), dtype=object)
+            return pd.Series(pd.Categorical.from_codes(codes, categories), index=series.index, name=series.name)
+        if pyarrow is not None and not arrow_text:
+            return series.astype("string[pyarrow]")
+    return series
+
+
+def compact_dtypes(df: pd.DataFrame) -> dict:
+    """Shrink `df` in place: smallest integer types, categorical or Arrow-backed text.
+
+    Converted values compare, hash and factorize the same as before, so the
+    analyses give identical results. Floats keep float64 because float32
+    would change statistics. Returns a report of the memory saved (object
+    column sizes are estimated from a sample of rows).
+    """
+    before = after = 0
+    converted = {}
+    for col in df.columns:
+        series = df[col]
+        size = _memory(series)
+        compact = _compact_series(series)
+        before += size
+        if compact is not series and compact.dtype != series.dtype:
+            converted[col] = f"{series.dtype}->{compact.dtype}"
+            df[col] = compact
+            size = _memory(compact)
+        after += size
+    return {
+        "bytes_before": before,
+        "bytes_after": after,
+        "saved_bytes": before - after,
+        "saved_fraction": (before - after) / before if before else 0.0,
+        "converted": converted,
+    }
@@ -1,10 +1,17 @@
 import os
+import time
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, START, END
+from langchain_core.runnables import RunnableConfig
 from Tasks import EDA_Tasks, State
 from Agents import EDA_Agents
+from dataset_cache import DatasetCache
+from metrics import PROBLEM_TYPE_DETECTIONS, RUN_SECONDS, stage
+from streaming import StreamingDataset, StreamingEDA_Tasks
+from incremental import INCREMENTAL, IncrementalDataset, IncrementalEDA_Tasks
 from sklearn.datasets import load_diabetes
-from langchain_groq import ChatGroq
+from llm_backends import make_chat_model
+from problem_type import PROBLEM_TYPE_SAMPLE_ROWS, PROBLEM_TYPE_THRESHOLD, detect_problem_type
 import pandas as pd
 
 load_dotenv()
@@ -16,8 +23,29 @@ load_dotenv()
 
 eda_agents = EDA_Agents()
 eda_tasks = EDA_Tasks()
+streaming_eda_tasks = StreamingEDA_Tasks()
+incremental_eda_tasks = IncrementalEDA_Tasks()
+dataset_cache = DatasetCache()
 
-llm = ChatGroq(api_key=os.getenv("GROQ_API_KEY"), model="llama-3.1-8b-instant")
+# Upper bound on executor nodes running at the same time after the strategy fans out.
+EXECUTOR_CONCURRENCY = int(os.getenv("EDA_EXECUTOR_CONCURRENCY", "4"))
+
+FOCUS_AREA_EXECUTERS = {
+    "descriptive_analysis": "EDA_executer_descriptive",
+    "correlation_analysis": "EDA_executer_correlation",
+    "outlier_detection": "EDA_executer_outlier_detection",
+    "feature_ranking": "EDA_executer_feature_ranking",
+}
+
+# How the profiling report and the EDA strategy are produced: "sequential" (two LLM calls, one after
+# the other), "parallel" (the same two calls at the same time) or "fused" (one structured call).
+STRATEGY_MODES = ("sequential", "parallel", "fused")
+STRATEGY_MODE = os.getenv("EDA_STRATEGY_MODE", "sequential").lower()
+
+# Files larger than this are analysed chunk by chunk instead of loaded whole.
+STREAMING_THRESHOLD_MB = float(os.getenv("EDA_STREAMING_THRESHOLD_MB", "1024"))
+
+llm = make_chat_model()
 
 
 llm_profiled_tools = llm.bind_tools(
@@ -41,50 +69,110 @@ def basic_tranformation(df):
     return df.head(5), df.columns.tolist()
 
 
-def get_eda(file_path:str):
-    df=pd.read_csv(file_path)
-    df_sample, columns = basic_tranformation(df)
+def _task_node(name):
+    # Graph nodes are shared across requests; the dataset for this run comes from the config.
+    def node(state: State, config: RunnableConfig):
+        run = config["configurable"]
+        return getattr(run["tasks"], name)(df=run["df"], state=state, cache=run.get("speculative"))
+
+    return node
+
+
+def _speculative_node(state: State, config: RunnableConfig):
+    # Runs alongside Problem_type: target-independent profiling overlaps the Domain_expert LLM call.
+    run = config["configurable"]
+    run["tasks"].Speculative_profiling(run["df"], run["speculative"])
+    return {}
+
+
+def _executer_node(focus_area):
+    task = _task_node(FOCUS_AREA_EXECUTERS[focus_area])
+
+    def node(state: State, config: RunnableConfig):
+        try:
+            result = task(state, config)
+        except Exception as e:
+            # One failing analysis should not discard the others running alongside it.
+            result = {"error": str(e)}
+        return {"EDA_Executer": {focus_area: result}}
+
+    return node
+
+
+def _route_focus_areas(state: State) -> list:
+    strategy = state["EDA_Resonner"] if isinstance(state["EDA_Resonner"], dict) else {}
+    selected = [
+        FOCUS_AREA_EXECUTERS[area]
+        for area in dict.fromkeys(strategy.get("focus_areas") or [])
+        if area in FOCUS_AREA_EXECUTERS
+    ]
+    return selected or [FOCUS_AREA_EXECUTERS["descriptive_analysis"]]
+
+
+def _timed(name, fn):
+    # Per-run stage records (duration, memory, LLM usage), read back for progress events and results.
+    def node(state: State, config: RunnableConfig):
+        with stage(name, config["configurable"].get("stages")):
+            return fn(state, config)
+
+    return node
+
+
+def _timings(stages: dict, total_s: float) -> dict:
+    llm_s = sum(record["llm_s"] for record in stages.values())
+    return {"total_s": total_s, "llm_s": llm_s, "stages": stages}
+
 
+def _problem_type_node(state: State, config: RunnableConfig):
+    run = config["configurable"]
+    df = run["df"] if isinstance(run["df"], pd.DataFrame) else run["df"].head(PROBLEM_TYPE_SAMPLE_ROWS)
+    guess = detect_problem_type(df)
+    confidence = guess[1] if guess else 0.0
+    if guess and confidence >= PROBLEM_TYPE_THRESHOLD:
+        PROBLEM_TYPE_DETECTIONS.inc("heuristic")
+        domain = guess[0]
+        path = "heuristic"
+    else:
+        PROBLEM_TYPE_DETECTIONS.inc("llm")
+        domain = eda_agents.Domain_expert(state, run["df_sample"], run["columns"])["Domain_expert"]
+        path = "llm"
+    return {"Domain_expert": {**domain, "detected_by": path, "heuristic_confidence": confidence}}
+
+
+def _eda_report_node(state: State, config: RunnableConfig):
+    return eda_agents.EDA_Report(config["configurable"]["df_sample"], state)
+
+
+def build_workflow(strategy_mode: str = STRATEGY_MODE):
+    if strategy_mode not in STRATEGY_MODES:
+        raise ValueError(f"Unknown strategy mode {strategy_mode!r}; expected one of {STRATEGY_MODES}")
     workflow = StateGraph(State)
 
-    workflow.add_node(
-        "Problem_type", lambda state: eda_agents.Domain_expert(state, df_sample, columns)
-    )
-    workflow.add_node(
-        "Dataset_profiling_regression",
-        lambda state: eda_tasks.Dataset_profiling_regression(df=df, state=state),
-    )
-    workflow.add_node(
-        "Dataset_profiling_classification",
-        lambda state: eda_tasks.Dataset_profiling_classification(df=df, state=state),
-    )
-    workflow.add_node(
-        "Dataset_profiling_clustering",
-        lambda state: eda_tasks.Dataset_profiling_clustering(df=df, state=state),
-    )
+    def add_node(name, fn):
+        workflow.add_node(name, _timed(name, fn))
 
-    workflow.add_node("Dataset_profiling_report", eda_agents.Dataset_profiling)
-    workflow.add_node("EDA_Strategy_Generator", eda_agents.EDA_Strategy_Generator)
-    workflow.add_node(
-        "EDA_executer_correlation",
-        lambda state: eda_tasks.EDA_executer_correlation(df=df, state=state),
-    )
-    workflow.add_node(
-        "EDA_executer_outlier_detection",
-        lambda state: eda_tasks.EDA_executer_outlier_detection(df=df, state=state),
-    )
-    workflow.add_node(
-        "EDA_executer_feature_ranking",
-        lambda state: eda_tasks.EDA_executer_feature_ranking(df=df, state=state),
-    )
-    workflow.add_node(
-        "EDA_executer_descriptive",
-        lambda state: eda_tasks.EDA_executer_descriptive(df=df, state=state),
-    )
+    add_node("Problem_type", _problem_type_node)
+    add_node("Speculative_profiling", _speculative_node)
+    add_node("Dataset_profiling_regression", _task_node("Dataset_profiling_regression"))
+    add_node("Dataset_profiling_classification", _task_node("Dataset_profiling_classification"))
+    add_node("Dataset_profiling_clustering", _task_node("Dataset_profiling_clustering"))
+
+    if strategy_mode == "sequential":
+        add_node("Dataset_profiling_report", lambda state, config: eda_agents.Dataset_profiling(state))
+        add_node("EDA_Strategy_Generator", lambda state, config: eda_agents.EDA_Strategy_Generator(state))
+        plan_start, plan_end = "Dataset_profiling_report", "EDA_Strategy_Generator"
+    else:
+        fused = strategy_mode == "fused"
+        add_node("EDA_Plan", lambda state, config: eda_agents.EDA_Plan(state, fused=fused))
+        plan_start = plan_end = "EDA_Plan"
+    for focus_area, node_name in FOCUS_AREA_EXECUTERS.items():
+        add_node(node_name, _executer_node(focus_area))
 
-    workflow.add_node("EDA_Report", lambda state: eda_agents.EDA_Report(df_sample, state))
+    add_node("EDA_Report", _eda_report_node)
 
     workflow.add_edge(START, "Problem_type")
+    # Same superstep as Problem_type, so profiling starts only once both have finished.
+    workflow.add_edge(START, "Speculative_profiling")
     workflow.add_conditional_edges(
         "Problem_type",
         lambda state: state["Domain_expert"].get("problem_type", "unknown") if isinstance(state["Domain_expert"], dict) else "unknown",
@@ -95,32 +183,71 @@ def get_eda(file_path:str):
         },
     )
 
-    workflow.add_edge("Dataset_profiling_regression", "Dataset_profiling_report")
-    workflow.add_edge("Dataset_profiling_classification", "Dataset_profiling_report")
-    workflow.add_edge("Dataset_profiling_clustering", "Dataset_profiling_report")
-    workflow.add_edge("Dataset_profiling_report", "EDA_Strategy_Generator")
+    workflow.add_edge("Dataset_profiling_regression", plan_start)
+    workflow.add_edge("Dataset_profiling_classification", plan_start)
+    workflow.add_edge("Dataset_profiling_clustering", plan_start)
+    if plan_start != plan_end:
+        workflow.add_edge(plan_start, plan_end)
 
+    # Every selected focus area runs in the same superstep; EDA_Report waits for all of them.
     workflow.add_conditional_edges(
-        "EDA_Strategy_Generator",
-        lambda state: state["EDA_Resonner"].get("focus_areas", ["descriptive_analysis"])[0] if isinstance(state["EDA_Resonner"], dict) else "descriptive_analysis",
-        {
-            "descriptive_analysis": "EDA_executer_descriptive",
-            "correlation_analysis": "EDA_executer_correlation",
-            "outlier_detection": "EDA_executer_outlier_detection",
-            "feature_ranking": "EDA_executer_feature_ranking",
-        },
+        plan_end,
+        _route_focus_areas,
+        list(FOCUS_AREA_EXECUTERS.values()),
     )
-
-    workflow.add_edge("EDA_executer_descriptive", "EDA_Report")
-    workflow.add_edge("EDA_executer_correlation", "EDA_Report")
-    workflow.add_edge("EDA_executer_outlier_detection", "EDA_Report")
-    workflow.add_edge("EDA_executer_feature_ranking", "EDA_Report")
+    for node_name in FOCUS_AREA_EXECUTERS.values():
+        workflow.add_edge(node_name, "EDA_Report")
 
     workflow.add_edge("EDA_Report", END)
 
-    chain = workflow.compile()
+    return workflow.compile()
+
+
+# Compiled once per process and shared by every request; other strategy modes are compiled on first use.
+chain = build_workflow()
+_mode_chains = {}
+
 
-    initial_state: State = {
+def _workflow(strategy_mode: str | None):
+    if strategy_mode is None or strategy_mode == STRATEGY_MODE:
+        return chain
+    if strategy_mode not in _mode_chains:
+        _mode_chains[strategy_mode] = build_workflow(strategy_mode)
+    return _mode_chains[strategy_mode]
+
+
+def load_run_context(file_path:str, streaming:bool|None=None, incremental:bool|None=None) -> dict:
+    if incremental is None:
+        incremental = INCREMENTAL
+    if streaming is None:
+        streaming = os.path.getsize(file_path) > STREAMING_THRESHOLD_MB * 1024 * 1024
+    if incremental:
+        # Persisted aggregates, extended with whatever was appended since the last run.
+        df = IncrementalDataset(file_path)
+        df_sample = df.head(5)
+        columns = df_sample.columns.tolist()
+        tasks = incremental_eda_tasks
+    elif streaming:
+        df = StreamingDataset(file_path)
+        df_sample = df.head(5)
+        columns = df_sample.columns.tolist()
+        tasks = streaming_eda_tasks
+    else:
+        df=dataset_cache.read_csv(file_path)
+        df_sample, columns = basic_tranformation(df)
+        tasks = eda_tasks
+    return {
+        "df": df,
+        "df_sample": df_sample,
+        "columns": columns,
+        "tasks": tasks,
+        "memory": df.attrs.get("memory") if isinstance(df, pd.DataFrame) else None,
+        "speculative": {},
+    }
+
+
+def _initial_state() -> State:
+    return {
         "Domain_expert": {},
         "Dataset_profiler": "",
         "EDA_Resonner": "",
@@ -128,18 +255,77 @@ def get_eda(file_path:str):
         "EDA_report_generator": "",
     }
 
+
+def get_eda(file_path:str, streaming:bool|None=None, incremental:bool|None=None, strategy_mode:str|None=None):
+    start = time.perf_counter()
+    stages = {}
+    with stage("load_dataset", stages) as record:
+        run_context = load_run_context(file_path, streaming, incremental)
+        if run_context["memory"]:
+            record["memory"] = run_context["memory"]
+    run_context["stages"] = stages
+
     try:
-        result = chain.invoke(initial_state)
+        result = _workflow(strategy_mode).invoke(
+            _initial_state(),
+            config={"configurable": run_context, "max_concurrency": EXECUTOR_CONCURRENCY},
+        )
+        result["timings"] = _timings(stages, time.perf_counter() - start)
+        RUN_SECONDS.observe(result["timings"]["total_s"], "ok")
         return result
     except Exception as e:
+        RUN_SECONDS.observe(time.perf_counter() - start, "error")
         return {
             "error": str(e),
+            "timings": _timings(stages, time.perf_counter() - start),
             "Domain_expert": {},
             "Dataset_profiler": "",
             "EDA_Resonner": "",
             "EDA_Executer": {},
             "EDA_report_generator": "",
         }
+def stream_eda(file_path:str, streaming:bool|None=None, incremental:bool|None=None, strategy_mode:str|None=None):
+    """Yield a progress event as each graph node finishes, then the final state.
+
+    Events are dicts: {"event": "node", "node", "output", "duration_s", "elapsed_s"},
+    then {"event": "result", "result", "elapsed_s"} or {"event": "error", "error"}.
+    """
+    start = time.perf_counter()
+    stages = {}
+    try:
+        with stage("load_dataset", stages) as record:
+            run_context = load_run_context(file_path, streaming, incremental)
+            if run_context["memory"]:
+                record["memory"] = run_context["memory"]
+        run_context["stages"] = stages
+        yield {"event": "node", "node": "load_dataset", "output": {}, "duration_s": stages["load_dataset"]["duration_s"], "elapsed_s": time.perf_counter() - start}
+
+        final_state = None
+        for mode, chunk in _workflow(strategy_mode).stream(
+            _initial_state(),
+            config={"configurable": run_context, "max_concurrency": EXECUTOR_CONCURRENCY},
+            stream_mode=["updates", "values"],
+        ):
+            if mode == "values":
+                final_state = chunk
+                continue
+            for node, output in chunk.items():
+                yield {
+                    "event": "node",
+                    "node": node,
+                    "output": output,
+                    "duration_s": stages.get(node, {}).get("duration_s"),
+                    "elapsed_s": time.perf_counter() - start,
+                }
+        elapsed = time.perf_counter() - start
+        RUN_SECONDS.observe(elapsed, "ok")
+        final_state = {**(final_state or {}), "timings": _timings(stages, elapsed)}
+        yield {"event": "result", "result": final_state, "elapsed_s": elapsed}
+    except Exception as e:
+        RUN_SECONDS.observe(time.perf_counter() - start, "error")
+        yield {"event": "error", "error": str(e), "elapsed_s": time.perf_counter() - start}
+
+
 # print("Domain expert:", result["Domain_expert"], "\n")
 # print("Domain profiler:", result["Dataset_profiler"], "\n")
 # print("EDA strategy:", result["EDA_Resonner"], "\n")
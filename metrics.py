@@ -0,0 +1,243 @@
+import bisect
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # /proc/self/statm only; memory deltas are reported as None elsewhere
+    psutil = None
+
+# How often RSS is sampled while stages run.
+RSS_SAMPLE_SECONDS = float(os.getenv("EDA_RSS_SAMPLE_SECONDS", "0.01"))
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+BYTES_BUCKETS = tuple(2**20 * 4**i for i in range(12))
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value) -> str:
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DURATION_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            counts, total = self._series.get(labels, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._series[labels] = (counts, total + value)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = _labels(self.labelnames, labels, [("le", _number(bound))])
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide metrics rendered in the Prometheus text exposition format (version 0.0.4)."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DURATION_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+
+registry = MetricsRegistry()
+
+NODE_SECONDS = registry.histogram("eda_node_duration_seconds", "Wall time of each graph node.", ("node",))
+NODE_RSS_DELTA = registry.histogram(
+    "eda_node_peak_rss_delta_bytes", "Peak process RSS while a node ran, above its RSS at the start.", ("node",), BYTES_BUCKETS
+)
+NODE_ERRORS = registry.counter("eda_node_errors_total", "Graph nodes that raised.", ("node",))
+LLM_SECONDS = registry.histogram("eda_llm_call_duration_seconds", "Wall time of each LLM call.", ("node", "cache"))
+LLM_CALLS = registry.counter("eda_llm_calls_total", "LLM calls by response cache outcome (hit, miss, off).", ("node", "cache"))
+LLM_TOKENS = registry.counter(
+    "eda_llm_tokens_total", "Prompt and completion tokens sent to the model (cache hits excluded).", ("node", "kind")
+)
+LLM_PROMPT_TOKENS = registry.histogram(
+    "eda_llm_prompt_tokens", "Prompt tokens per LLM call.", ("node",), TOKEN_BUCKETS
+)
+PROBLEM_TYPE_DETECTIONS = registry.counter(
+    "eda_problem_type_detections_total", "How the problem type was decided (heuristic or llm).", ("path",)
+)
+RUN_SECONDS = registry.histogram("eda_run_duration_seconds", "End-to-end wall time of an analysis.", ("status",))
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes():
+    """Current resident set size of this process, or None if it can't be read."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    return None
+
+
+class RssSampler:
+    """One background thread sampling RSS while any stage is open.
+
+    Every open stage keeps the highest RSS seen since it started, so a
+    stage's peak is measured from its own starting point rather than from
+    the process-lifetime high-water mark.
+    """
+
+    def __init__(self, interval: float = RSS_SAMPLE_SECONDS):
+        self.interval = interval
+        self._peaks = {}
+        self._lock = threading.Lock()
+        self._active = threading.Condition(self._lock)
+        self._thread = None
+
+    def _sample(self, rss: int):
+        for key, peak in self._peaks.items():
+            if rss > peak:
+                self._peaks[key] = rss
+
+    def _loop(self):
+        while True:
+            with self._active:
+                while not self._peaks:
+                    self._active.wait()
+            rss = rss_bytes()
+            with self._lock:
+                self._sample(rss)
+            time.sleep(self.interval)
+
+    def start(self, rss: int) -> object:
+        key = object()
+        with self._active:
+            self._peaks[key] = rss
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="eda-rss", daemon=True)
+                self._thread.start()
+            self._active.notify()
+        return key
+
+    def stop(self, key: object) -> int:
+        """The highest RSS seen since start(key), including now."""
+        rss = rss_bytes()
+        with self._lock:
+            self._sample(rss)
+            return self._peaks.pop(key)
+
+
+_rss_sampler = RssSampler()
+_current_stage = contextvars.ContextVar("eda_stage", default=None)
+
+
+@contextmanager
+def stage(name: str, stages: dict | None = None):
+    """Time a pipeline stage; LLM calls made inside it are attributed to it.
+
+    The record is stored in `stages[name]` (when given) and fed to the
+    node histograms. `peak_rss_delta_bytes` is the highest sampled RSS
+    while the stage ran minus the RSS when it started. RSS is process-wide,
+    so stages running concurrently see each other's allocations.
+    """
+    record = {
+        "duration_s": None,
+        "peak_rss_delta_bytes": None,
+        "llm_calls": 0,
+        "llm_s": 0.0,
+        "cache_hits": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+    }
+    if stages is not None:
+        stages[name] = record
+    token = _current_stage.set((name, record))
+    rss_before = rss_bytes()
+    sample = _rss_sampler.start(rss_before) if rss_before is not None else None
+    start = time.perf_counter()
+    try:
+        yield record
+    except Exception:
+        NODE_ERRORS.inc(name)
+        raise
+    finally:
+        _current_stage.reset(token)
+        record["duration_s"] = time.perf_counter() - start
+        NODE_SECONDS.observe(record["duration_s"], name)
+        if sample is not None:
+            record["peak_rss_delta_bytes"] = _rss_sampler.stop(sample) - rss_before
+            NODE_RSS_DELTA.observe(record["peak_rss_delta_bytes"], name)
+
+
+def record_llm_call(duration_s: float, cache: str, prompt_tokens: int, completion_tokens: int):
+    current = _current_stage.get()
+    name, record = current if current is not None else ("none", None)
+    LLM_SECONDS.observe(duration_s, name, cache)
+    LLM_CALLS.inc(name, cache)
+    if cache != "hit":
+        LLM_TOKENS.inc(name, "prompt", amount=prompt_tokens)
+        LLM_TOKENS.inc(name, "completion", amount=completion_tokens)
+        LLM_PROMPT_TOKENS.observe(prompt_tokens, name)
+    if record is not None:
+        record["llm_calls"] += 1
+        record["llm_s"] += duration_s
+        if cache == "hit":
+            record["cache_hits"] += 1
+        else:
+            record["prompt_tokens"] += prompt_tokens
+            record["completion_tokens"] += completion_tokens
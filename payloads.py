@@ -0,0 +1,178 @@
+import gzip
+import json
+import os
+from urllib.parse import quote
+
+try:
+    import orjson
+except ImportError:  # falls back to the standard library encoder
+    orjson = None
+try:
+    import zstandard
+except ImportError:  # gzip only
+    zstandard = None
+
+# Approximate size of the summary-first result payload; larger sections are left to /jobs/{id}/result/... pages.
+SUMMARY_BYTES = int(os.getenv("EDA_SUMMARY_BYTES", "65536"))
+PAGE_SIZE = int(os.getenv("EDA_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("EDA_MAX_PAGE_SIZE", "1000"))
+# Response encodings in order of preference; empty disables compression.
+COMPRESSION = [e for e in os.getenv("EDA_COMPRESSION", "zstd,gzip").replace(" ", "").split(",") if e]
+COMPRESS_MIN_BYTES = int(os.getenv("EDA_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# Containers with more children than this are deferred as a whole instead of being split further.
+MAX_SPLIT = 32
+# Sections up to this size are always inline; a page request would cost more than they do.
+INLINE_BYTES = 1024
+
+
+def dumps(obj) -> bytes:
+    """Compact JSON bytes; numpy values, non-string keys and anything else via str()."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str, separators=(",", ":")).encode()
+
+
+def _accepted(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    return accepted
+
+
+def choose_encoding(accept_encoding: str | None):
+    accepted = _accepted(accept_encoding or "")
+    for encoding in COMPRESSION:
+        if encoding in accepted or "*" in accepted:
+            if encoding == "zstd" and zstandard is None:
+                continue
+            if encoding in ("zstd", "gzip"):
+                return encoding
+    return None
+
+
+def encode(obj, accept_encoding: str | None = None) -> tuple:
+    """(body, headers) for a JSON response, compressed with the best encoding the client accepts."""
+    body = dumps(obj)
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = choose_encoding(accept_encoding) if len(body) >= COMPRESS_MIN_BYTES else None
+    if encoding == "zstd":
+        # Compressor objects are not thread-safe; they are cheap to create per response.
+        body = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return body, headers
+
+
+def _splittable(value) -> bool:
+    return isinstance(value, (dict, list)) and len(value) <= MAX_SPLIT
+
+
+def _children(value):
+    return value.items() if isinstance(value, dict) else enumerate(value)
+
+
+def _measure(value, sizes: dict) -> int:
+    # Serializes every subtree once: a split container's size is the sum of its children's.
+    if _splittable(value):
+        size = 2 + sum(_measure(child, sizes) + len(str(key)) + 4 for key, child in _children(value))
+    else:
+        size = len(dumps(value))
+    sizes[id(value)] = size
+    return size
+
+
+def escape(key) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _outline(value, budget: float, pointer: str, href: str, sizes: dict):
+    size = sizes[id(value)]
+    if size <= max(budget, INLINE_BYTES) or not isinstance(value, (dict, list)):
+        # Text and numbers cannot be paged, so they are always inline.
+        return value
+    if not _splittable(value):
+        return {
+            "deferred": True,
+            "pointer": pointer,
+            "href": href + quote(pointer, safe="/~"),
+            "items": len(value),
+            "bytes": size,
+        }
+    # Smallest children first, each given an equal share of what is left, so small
+    # sections stay inline and the big ones split the rest of the budget.
+    children = sorted(_children(value), key=lambda kv: sizes[id(kv[1])])
+    remaining = budget
+    outlined = {}
+    for n, (key, child) in enumerate(children):
+        share = remaining / (len(children) - n)
+        outlined[key] = _outline(child, share, f"{pointer}/{escape(key)}", href, sizes)
+        remaining -= sizes[id(child)] if outlined[key] is child else len(dumps(outlined[key]))
+    if isinstance(value, list):
+        return [outlined[i] for i in range(len(value))]
+    return {key: outlined[key] for key in value}
+
+
+def summarize(payload: dict, href: str, budget: int = SUMMARY_BYTES) -> dict:
+    """`payload` within about `budget` bytes, with the largest sections replaced by stubs.
+
+    A stub is {"deferred": true, "pointer", "href", "items", "bytes"}: the
+    JSON pointer of the section, the URL that pages through it (`href` is
+    the job's result URL), how many entries it has and its approximate
+    encoded size. Small sections and all text stay inline.
+    """
+    sizes = {}
+    _measure(payload, sizes)
+    return _outline(payload, budget, "", href, sizes)
+
+
+def resolve(payload, pointer: str):
+    """The value at a JSON pointer (RFC 6901); KeyError if there is none."""
+    value = payload
+    for token in pointer.strip("/").split("/") if pointer.strip("/") else []:
+        token = token.replace("~1", "/").replace("~0", "~")
+        if isinstance(value, dict):
+            keys = {str(k): k for k in value}
+            if token not in keys:
+                raise KeyError(pointer)
+            value = value[keys[token]]
+        elif isinstance(value, list) and token.isdigit() and int(token) < len(value):
+            value = value[int(token)]
+        else:
+            raise KeyError(pointer)
+    return value
+
+
+def page(payload, pointer: str, offset: int = 0, limit: int = PAGE_SIZE) -> dict:
+    """Entries [offset, offset + limit) of the dict or list at `pointer`, in their original order."""
+    value = resolve(payload, pointer)
+    if not isinstance(value, (dict, list)):
+        raise TypeError(f"{pointer or '/'} is not a dict or a list")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = max(0, offset)
+    if isinstance(value, dict):
+        keys = list(value)[offset : offset + limit]
+        items = {k: value[k] for k in keys}
+    else:
+        items = value[offset : offset + limit]
+    end = offset + len(items)
+    return {
+        "pointer": pointer,
+        "offset": offset,
+        "limit": limit,
+        "total": len(value),
+        "next_offset": end if end < len(value) else None,
+        "items": items,
+    }
@@ -0,0 +1,93 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+from Tasks import ProblemType
+
+# Heuristic detections at or above this confidence skip the Domain_expert LLM call; above 1 never skips.
+PROBLEM_TYPE_THRESHOLD = float(os.getenv("EDA_PROBLEM_TYPE_THRESHOLD", "0.8"))
+# Rows read from the top of a streamed file to judge candidate target columns.
+PROBLEM_TYPE_SAMPLE_ROWS = int(os.getenv("EDA_PROBLEM_TYPE_SAMPLE_ROWS", "10000"))
+
+TARGET_NAMES = {"target", "label", "labels", "class", "y", "outcome", "response", "output"}
+TARGET_TOKENS = {"target", "label", "class", "outcome"}
+MAX_CLASSES = 50
+
+
+def _tokens(name: str) -> list:
+    spaced = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", str(name))
+    return [t for t in re.split(r"[^0-9a-zA-Z]+", spaced.lower()) if t]
+
+
+def _name_confidence(name: str, is_last: bool) -> float:
+    tokens = _tokens(name)
+    if "".join(tokens) in TARGET_NAMES:
+        return 0.95
+    if "id" in tokens:
+        return 0.0
+    if TARGET_TOKENS.intersection(tokens):
+        return 0.85
+    return 0.6 if is_last else 0.0
+
+
+def _target_kind(series: pd.Series):
+    """(problem_type, confidence) judged from a candidate target's values, or None if it can't be one."""
+    values = series.dropna()
+    n = len(values)
+    if not n:
+        return None
+    distinct = values.nunique()
+    if is_bool_dtype(values.dtype) or not is_numeric_dtype(values.dtype):
+        if distinct <= MAX_CLASSES or distinct / n <= 0.05:
+            return "classification", 0.98 if distinct == 2 else 0.95
+        # Mostly unique text: an identifier or free text, not a label.
+        return None
+    numbers = values.to_numpy(dtype="float64")
+    if not np.array_equal(numbers, np.round(numbers)):
+        return "regression", 0.95
+    if distinct <= 2:
+        return "classification", 0.98
+    if distinct <= 20 and distinct / n < 0.05:
+        # Few integer levels: usually class codes, sometimes an ordinal or a count.
+        return "classification", 0.85
+    return "regression", 0.8
+
+
+def detect_problem_type(df: pd.DataFrame):
+    """Guess the problem type and target from column names and values, without the LLM.
+
+    Candidate targets are columns named like a target (target, label,
+    class, ...) and, more weakly, the last column. The candidate's values
+    decide between classification and regression. Returns
+    (ProblemType fields as a dict, confidence), or None when nothing looks
+    like a target; clustering is left to the LLM.
+    """
+    columns = list(df.columns)
+    candidates = [(_name_confidence(c, i == len(columns) - 1), c) for i, c in enumerate(columns)]
+    best = None
+    for name_conf, col in sorted((c for c in candidates if c[0] > 0), key=lambda c: -c[0]):
+        kind = _target_kind(df[col])
+        if kind is None:
+            continue
+        problem_type, kind_conf = kind
+        confidence = name_conf * kind_conf
+        if best is None or confidence > best[2]:
+            best = (problem_type, col, confidence)
+    if best is None:
+        return None
+
+    problem_type, target, confidence = best
+    confidence = round(confidence, 3)
+    rest = round((1 - confidence) / 2, 3)
+    scores = {t: (confidence if t == problem_type else rest) for t in ("regression", "classification", "clustering")}
+    result = ProblemType(
+        problem_type=problem_type,
+        target_variable=str(target),
+        confidence_score_regression=scores["regression"],
+        confidence_score_classification=scores["classification"],
+        confidence_score_clustering=scores["clustering"],
+    )
+    return result.model_dump(), confidence
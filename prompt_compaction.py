@@ -0,0 +1,132 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+# Prompt token budgets per agent (estimated tokens, see estimate_tokens).
+PROMPT_BUDGETS = {
+    "Domain_expert": int(os.getenv("EDA_PROMPT_BUDGET_DOMAIN_EXPERT", "1500")),
+    "Dataset_profiling": int(os.getenv("EDA_PROMPT_BUDGET_PROFILING", "2000")),
+}
+MAX_VALUE_CHARS = int(os.getenv("EDA_PROMPT_MAX_VALUE_CHARS", "24"))
+MAX_EXAMPLES = 3
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English/code on Llama-style BPE vocabularies.
+    return len(text) // 4 + 1
+
+
+class PromptStats:
+    """Per-agent prompt token counters (calls, last, max, total)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, agent: str, prompt: str) -> int:
+        tokens = estimate_tokens(prompt)
+        with self._lock:
+            s = self._stats.setdefault(agent, {"calls": 0, "last_tokens": 0, "max_tokens": 0, "total_tokens": 0})
+            s["calls"] += 1
+            s["last_tokens"] = tokens
+            s["max_tokens"] = max(s["max_tokens"], tokens)
+            s["total_tokens"] += tokens
+        return tokens
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {agent: dict(s) for agent, s in self._stats.items()}
+
+
+prompt_stats = PromptStats()
+
+
+def _truncate(value, limit: int = MAX_VALUE_CHARS) -> str:
+    text = str(value)
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _fit(render, max_level: int, budget: int) -> str:
+    # render(level) gets shorter as level grows; return the richest version within budget.
+    text = render(0)
+    for level in range(1, max_level + 1):
+        if estimate_tokens(text) <= budget:
+            break
+        text = render(level)
+    return text
+
+
+def schema_summary(df_sample: pd.DataFrame, columns: list, budget: int = PROMPT_BUDGETS["Domain_expert"]) -> str:
+    """One line per column: name, dtype, a few truncated examples and sample stats."""
+    lines = []
+    for col in columns:
+        series = df_sample[col] if col in df_sample else pd.Series(dtype="object")
+        non_null = series.dropna()
+        examples = [_truncate(v) for v in pd.unique(non_null)[:MAX_EXAMPLES]]
+        stats = f"nulls={int(series.isna().sum())}/{len(series)}"
+        if pd.api.types.is_numeric_dtype(series.dtype) and len(non_null):
+            stats += f" range=[{non_null.min():.4g}, {non_null.max():.4g}]"
+        lines.append((str(col), str(series.dtype), examples, stats))
+
+    def render(level):
+        # level 0: full lines; 1: one example; 2: no examples; 3+: drop trailing columns.
+        n_examples = {0: MAX_EXAMPLES, 1: 1}.get(level, 0)
+        keep = len(lines) if level < 3 else max(1, len(lines) >> (level - 2))
+        out = []
+        for name, dtype, examples, stats in lines[:keep]:
+            parts = [f"{_truncate(name, 64)} ({dtype})"]
+            if n_examples:
+                parts.append("e.g. " + ", ".join(examples[:n_examples]))
+            if level < 2:
+                parts.append(stats)
+            out.append("- " + "; ".join(parts))
+        if keep < len(lines):
+            out.append(f"- ... {len(lines) - keep} more columns: " + ", ".join(_truncate(n, 32) for n, *_ in lines[keep:keep + (50 >> (level - 2))]))
+        return f"{len(lines)} columns\n" + "\n".join(out)
+
+    return _fit(render, 3 + max(1, len(lines)).bit_length(), budget)
+
+
+def _top(items: dict, n: int) -> dict:
+    return dict(sorted(items.items(), key=lambda kv: kv[1], reverse=True)[:n])
+
+
+def compact_profile(profile, budget: int = PROMPT_BUDGETS["Dataset_profiling"]) -> str:
+    """Condensed BasicEDA: only non-zero missing counts, capped lists and dtype counts."""
+    eda = json.loads(profile) if isinstance(profile, str) else dict(profile or {})
+    missing = {k: v for k, v in (eda.get("missing_values") or {}).items() if v}
+    dtypes = eda.get("dtypes") or {}
+    dtype_counts = {}
+    for dtype in dtypes.values():
+        dtype_counts[dtype] = dtype_counts.get(dtype, 0) + 1
+
+    def render(level):
+        n = max(1, 40 >> level)
+        summary = {
+            "shape": eda.get("shape"),
+            "dtype_counts": dtype_counts,
+            "columns_with_missing": len(missing),
+            "top_missing": _top(missing, n),
+            "constant_columns": (eda.get("constant_columns") or [])[:n],
+            "duplicate_rows": eda.get("duplicate_rows"),
+            "class_imbalance": _top(eda.get("class_imbalance") or {}, n) or None,
+            "top_categorical_cardinality": _top(eda.get("categorical_cardinality") or {}, n) or None,
+            "numeric_columns": [_truncate(c, 40) for c in (eda.get("numeric_columns") or [])[:n]],
+            "categorical_columns": [_truncate(c, 40) for c in (eda.get("categorical_columns") or [])[:n]],
+        }
+        for key in ("numeric_columns", "categorical_columns", "constant_columns"):
+            total = len(eda.get(key) or [])
+            if total > n:
+                summary[key].append(f"... +{total - n} more")
+        if isinstance(summary["duplicate_rows"], dict):
+            dups = summary["duplicate_rows"]
+            summary["duplicate_rows"] = {
+                "count": dups["count"],
+                "fraction": round(dups["fraction"], 4),
+                "example_groups": dups["example_groups"][: max(1, n // 10)],
+            }
+        return json.dumps({k: v for k, v in summary.items() if v not in (None, [], {})}, default=str)
+
+    return _fit(render, 6, budget)
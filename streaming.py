@@ -0,0 +1,413 @@
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+from correlation import CORRELATION_METHODS, CoMoments, correlation_summary
+from duplicates import DuplicateIndex
+from sketches import HyperLogLog, KLLSketch
+from Tasks import (
+    OUTLIER_METHODS,
+    OUTLIER_SAMPLE_SIZE,
+    PROFILE_FIELDS,
+    SPECULATIVE_TASKS,
+    BasicEDA,
+    DuplicateRows,
+    EDA_Tasks,
+    State,
+    summarize_outliers,
+)
+
+DEFAULT_CHUNK_ROWS = int(os.getenv("EDA_CHUNK_ROWS", "100000"))
+MAX_TRACKED_DISTINCT = int(os.getenv("EDA_MAX_TRACKED_DISTINCT", "100000"))
+SAMPLE_ROWS = int(os.getenv("EDA_SAMPLE_ROWS", "50000"))
+# MAD needs a second median over deviations, which the one-pass aggregates cannot provide.
+STREAMING_OUTLIER_METHODS = ("iqr", "zscore")
+
+
+def _promote_dtype(prev, dtype):
+    # A column can parse as int64 in one chunk and float64 (NaNs) or object in another.
+    if prev is None or prev == dtype:
+        return dtype
+    if "object" in (prev, dtype):
+        return "object"
+    try:
+        return str(np.result_type(prev, dtype))
+    except TypeError:
+        return "object"
+
+
+class ColumnMoments:
+    """count / mean / M2 / min / max plus a quantile sketch, merged with Chan's update."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = KLLSketch()
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return
+        other = ColumnMoments()
+        # Seeded by offset: chunk sketches sharing one coin-flip sequence would bias the merge the same way.
+        other.sketch = KLLSketch(seed=self.count)
+        other.count = int(values.size)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        other.sketch.update(values)
+        self.merge(other)
+
+    def merge(self, other: "ColumnMoments") -> "ColumnMoments":
+        if not other.count:
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta**2 * self.count * other.count / n
+        self.mean += delta * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else float("nan")
+
+    def describe(self) -> dict:
+        q1, q2, q3 = self.sketch.quantiles([0.25, 0.5, 0.75])
+        empty = not self.count
+        return {
+            "count": float(self.count),
+            "mean": float("nan") if empty else self.mean,
+            "std": self.std,
+            "min": float("nan") if empty else self.min,
+            "25%": q1,
+            "50%": q2,
+            "75%": q3,
+            "max": float("nan") if empty else self.max,
+        }
+
+
+class StreamingStats:
+    """Mergeable per-dataset aggregates built one chunk at a time."""
+
+    def __init__(self, target_variable=None):
+        self.target_variable = target_variable
+        self.n_rows = 0
+        self.columns = None
+        self.numeric_columns = []
+        self.dtypes = {}
+        self.missing = {}
+        self.distinct = {}
+        self.distinct_overflow = set()
+        self.moments = {}
+        self.comoments = None
+        self.class_counts = {}
+        self.duplicates = DuplicateIndex()
+        self.duplicate_rows = None
+        self.sample = None
+        self.sample_rows = None
+        self._sample_keys = None
+        self._rng = np.random.default_rng(0)
+
+    def _init_schema(self, chunk: pd.DataFrame):
+        self.columns = chunk.columns.tolist()
+        self.numeric_columns = [
+            c
+            for c in self.columns
+            if is_numeric_dtype(chunk[c].dtype) and not is_bool_dtype(chunk[c].dtype)
+        ]
+        self.missing = {c: 0 for c in self.columns}
+        self.distinct = {c: set() for c in self.columns if c not in self.numeric_columns}
+        self.moments = {c: ColumnMoments() for c in self.numeric_columns}
+        shift = chunk[self.numeric_columns].mean(numeric_only=True).fillna(0.0).to_numpy()
+        self.comoments = CoMoments(self.numeric_columns, shift)
+
+    def _overflow(self, col):
+        # Past the exact-set cap the column switches to a HyperLogLog sketch.
+        hll = HyperLogLog()
+        hll.update(np.fromiter(self.distinct[col], dtype=object, count=len(self.distinct[col])))
+        self.distinct[col] = hll
+        self.distinct_overflow.add(col)
+
+    def update(self, chunk: pd.DataFrame):
+        if self.columns is None:
+            self._init_schema(chunk)
+        self.n_rows += len(chunk)
+
+        for col in self.columns:
+            series = chunk[col]
+            self.dtypes[col] = _promote_dtype(self.dtypes.get(col), str(series.dtype))
+            self.missing[col] += int(series.isna().sum())
+
+            if col in self.distinct:
+                values = pd.unique(series.dropna())
+                seen = self.distinct[col]
+                if col in self.distinct_overflow:
+                    seen.update(np.asarray(values, dtype=object))
+                else:
+                    seen.update(values)
+                    if len(seen) > MAX_TRACKED_DISTINCT:
+                        self._overflow(col)
+
+            if col == self.target_variable:
+                for k, v in series.value_counts().items():
+                    self.class_counts[k] = self.class_counts.get(k, 0) + int(v)
+
+        if self.numeric_columns:
+            X = (
+                chunk[self.numeric_columns]
+                .apply(pd.to_numeric, errors="coerce")
+                .to_numpy(dtype="float64", na_value=np.nan)
+            )
+            for j, col in enumerate(self.numeric_columns):
+                self.moments[col].update(X[:, j])
+            self.comoments.update(X)
+
+        self.duplicates.update(chunk)
+        self._update_sample(chunk, np.arange(self.n_rows - len(chunk), self.n_rows))
+
+    def _update_sample(self, chunk: pd.DataFrame, rows: np.ndarray):
+        # Bottom-k by random key over all rows seen == uniform sample without replacement.
+        # sample_rows holds each sampled row's position in the dataset.
+        keys = self._rng.random(len(chunk))
+        if self.sample is not None:
+            chunk = pd.concat([self.sample, chunk], ignore_index=True)
+            keys = np.concatenate([self._sample_keys, keys])
+            rows = np.concatenate([self.sample_rows, rows])
+        if len(keys) > SAMPLE_ROWS:
+            keep = np.argpartition(keys, SAMPLE_ROWS)[:SAMPLE_ROWS]
+            chunk, keys, rows = chunk.iloc[keep].reset_index(drop=True), keys[keep], rows[keep]
+        self.sample, self._sample_keys, self.sample_rows = chunk.reset_index(drop=True), keys, rows
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.__dict__.update(other.__dict__)
+            return self
+        offset = self.n_rows
+        self.n_rows += other.n_rows
+        for col in self.columns:
+            self.missing[col] += other.missing[col]
+        for col in self.distinct:
+            theirs = other.distinct[col]
+            if col in other.distinct_overflow and col not in self.distinct_overflow:
+                self._overflow(col)
+            if col in self.distinct_overflow:
+                if isinstance(theirs, HyperLogLog):
+                    self.distinct[col].merge(theirs)
+                else:
+                    self.distinct[col].update(np.fromiter(theirs, dtype=object, count=len(theirs)))
+            else:
+                self.distinct[col] |= theirs
+                if len(self.distinct[col]) > MAX_TRACKED_DISTINCT:
+                    self._overflow(col)
+        for col in self.numeric_columns:
+            self.moments[col].merge(other.moments[col])
+        self.comoments.merge(other.comoments)
+        for k, v in other.class_counts.items():
+            self.class_counts[k] = self.class_counts.get(k, 0) + v
+        self.duplicates.merge(other.duplicates)
+        self.duplicate_rows = None
+        self.sample = pd.concat([self.sample, other.sample], ignore_index=True)
+        self._sample_keys = np.concatenate([self._sample_keys, other._sample_keys])
+        self.sample_rows = np.concatenate([self.sample_rows, other.sample_rows + offset])
+        self._update_sample(self.sample.iloc[:0], np.empty(0, dtype=np.int64))
+        return self
+
+    def add_target(self, target_variable, chunks):
+        """Class counts for a target chosen after the pass, from chunks holding just that column."""
+        self.target_variable = target_variable
+        self.class_counts = {}
+        if target_variable not in (self.columns or ()):
+            return
+        for chunk in chunks:
+            for k, v in chunk[target_variable].value_counts().items():
+                self.class_counts[k] = self.class_counts.get(k, 0) + int(v)
+
+    def distinct_count(self, col) -> int:
+        seen = self.distinct[col]
+        return seen.count() if isinstance(seen, HyperLogLog) else len(seen)
+
+    def basic_eda(self, problem_type: str) -> BasicEDA:
+        target_variable = self.target_variable
+        fields = PROFILE_FIELDS.get(problem_type, ())
+        constant_columns = []
+        for col in self.columns:
+            missing = self.missing[col]
+            if col in self.moments:
+                m = self.moments[col]
+                constant = (missing == self.n_rows and self.n_rows > 0) or (
+                    missing == 0 and m.count > 0 and m.min == m.max
+                )
+            else:
+                constant = self.distinct_count(col) + (1 if missing else 0) == 1
+            if constant:
+                constant_columns.append(col)
+
+        numeric_cols = [c for c in self.numeric_columns if c != target_variable]
+        categorical_cols = [
+            c for c in self.columns if c not in self.numeric_columns and c != target_variable
+        ]
+        class_imbalance = None
+        if "class_imbalance" in fields and target_variable in self.columns:
+            class_imbalance = dict(
+                sorted(self.class_counts.items(), key=lambda item: item[1], reverse=True)
+            )
+        cardinality = None
+        approximate = {}
+        if "categorical_cardinality" in fields:
+            cardinality = {c: self.distinct_count(c) for c in categorical_cols}
+            sketched = [c for c in categorical_cols if c in self.distinct_overflow]
+            if sketched:
+                approximate["categorical_cardinality"] = sketched
+
+        return BasicEDA(
+            shape=(self.n_rows, len(self.columns)),
+            missing_values=dict(self.missing),
+            dtypes=dict(self.dtypes),
+            class_imbalance=class_imbalance,
+            categorical_cardinality=cardinality,
+            duplicate_rows=self.duplicate_rows,
+            constant_columns=constant_columns,
+            all_columns=list(self.columns),
+            numeric_columns=numeric_cols,
+            categorical_columns=categorical_cols,
+            approximate_values=approximate,
+        )
+
+    def describe(self) -> dict:
+        return {col: self.moments[col].describe() for col in self.numeric_columns}
+
+    def outlier_bounds(self, columns, method: str):
+        moments = [self.moments[c] for c in columns]
+        if method == "iqr":
+            q = np.array([m.sketch.quantiles([0.25, 0.75]) for m in moments]).reshape(-1, 2).T
+            iqr = q[1] - q[0]
+            return q[0] - 1.5 * iqr, q[1] + 1.5 * iqr
+        if method == "zscore":
+            mean = np.array([m.mean if m.count else np.nan for m in moments])
+            std = np.array([m.std for m in moments])
+            return mean - 3 * std, mean + 3 * std
+        raise ValueError(f"Outlier method {method!r} is not supported in streaming mode")
+
+
+class StreamingDataset:
+    """A CSV read lazily in bounded chunks; peak memory depends on chunk_rows, not file size."""
+
+    def __init__(self, file_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.file_path = file_path
+        self.chunk_rows = chunk_rows
+        self._stats = None
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return pd.read_csv(self.file_path, nrows=n)
+
+    def chunks(self, columns=None):
+        yield from pd.read_csv(self.file_path, chunksize=self.chunk_rows, usecols=columns)
+
+    def stats(self, target_variable=None) -> StreamingStats:
+        if self._stats is not None and self._stats.target_variable is None and target_variable is not None:
+            # Built speculatively before the target was known: only the class counts are missing.
+            self._stats.add_target(target_variable, self.chunks([target_variable]))
+        if self._stats is None or self._stats.target_variable != target_variable:
+            stats = StreamingStats(target_variable)
+            for chunk in self.chunks():
+                stats.update(chunk)
+            self._stats = stats
+        return self._stats
+
+
+class StreamingEDA_Tasks(EDA_Tasks):
+    """EDA_Tasks over a StreamingDataset: every node reads the same one-pass aggregates."""
+
+    def Speculative_profiling(self, df: StreamingDataset, cache: dict) -> None:
+        # The one-pass aggregates and the duplicate pass are target-independent; class counts come later.
+        if "profile" in SPECULATIVE_TASKS:
+            stats = df.stats(None)
+            if stats.duplicate_rows is None:
+                stats.duplicate_rows = DuplicateRows(**stats.duplicates.verify(df.chunks()))
+
+    def Dataset_profiling(self, df: StreamingDataset, state: State, problem_type: str, cache: dict | None = None) -> dict:
+        target_variable = state["Domain_expert"]["target_variable"]
+        stats = df.stats(target_variable)
+        if stats.duplicate_rows is None:
+            # Second pass: re-read only rows whose hash was seen more than once.
+            stats.duplicate_rows = DuplicateRows(**stats.duplicates.verify(df.chunks()))
+        result = stats.basic_eda(problem_type)
+        return {"Dataset_profiler": result.json()}
+
+    def EDA_executer_descriptive(self, df: StreamingDataset, state: State, cache: dict | None = None) -> dict:
+        return df.stats(state["Domain_expert"]["target_variable"]).describe()
+
+    def EDA_executer_correlation(self, df: StreamingDataset, state: State, cache: dict | None = None) -> dict:
+        target_variable = state["Domain_expert"]["target_variable"]
+        stats = df.stats(target_variable)
+        cols = [c for c in stats.numeric_columns if c != target_variable]
+        result = {}
+        for method in CORRELATION_METHODS:
+            if method == "pearson":
+                result[method] = correlation_summary(stats.comoments.subset(cols))
+            elif method == "spearman":
+                # Second pass: map values to ranks through each column's quantile sketch.
+                sketches = [stats.moments[c].sketch for c in cols]
+                comoments = CoMoments(cols, np.array([s.n / 2 for s in sketches]))
+                for chunk in df.chunks():
+                    values = chunk[cols].apply(pd.to_numeric, errors="coerce").to_numpy(
+                        dtype="float64", na_value=np.nan
+                    )
+                    ranks = np.column_stack(
+                        [s.rank(values[:, j]) for j, s in enumerate(sketches)]
+                    ) if cols else values
+                    comoments.update(ranks)
+                result[method] = correlation_summary(comoments)
+                result[method]["exact"] = all(s.exact for s in sketches)
+            else:
+                raise ValueError(f"Unknown correlation method: {method}")
+        return result
+
+    def EDA_executer_outlier_detection(self, df: StreamingDataset, state: State, cache: dict | None = None) -> dict:
+        # Bounds come from the one-pass aggregates; a second bounded pass counts and samples rows.
+        target_variable = state["Domain_expert"]["target_variable"]
+        stats = df.stats(target_variable)
+        cols = [c for c in stats.numeric_columns if c != target_variable]
+        methods = [m for m in OUTLIER_METHODS if m in STREAMING_OUTLIER_METHODS]
+        bounds = {m: stats.outlier_bounds(cols, m) for m in methods}
+        non_null = np.array([stats.moments[c].count for c in cols])
+        results = {}
+
+        for chunk in df.chunks():
+            values = (
+                chunk[cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            )
+            for method, (lower, upper) in bounds.items():
+                part = summarize_outliers(
+                    cols, (values < lower) | (values > upper), chunk.index, non_null, lower, upper
+                )
+                merged = results.setdefault(method, part)
+                if merged is part:
+                    continue
+                for col, summary in part.items():
+                    acc = merged[col]
+                    acc["count"] += summary["count"]
+                    acc["fraction"] += summary["fraction"]
+                    room = OUTLIER_SAMPLE_SIZE - len(acc["sample_indices"])
+                    acc["sample_indices"].extend(summary["sample_indices"][:room])
+
+        if "iqr" in results:
+            for col in cols:
+                results["iqr"][col]["exact"] = stats.moments[col].sketch.exact
+        return results
+
+    def EDA_executer_feature_ranking(self, df: StreamingDataset, state: State, cache: dict | None = None) -> dict:
+        target_variable = state["Domain_expert"]["target_variable"]
+        return super().EDA_executer_feature_ranking(df.stats(target_variable).sample, state)
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import uuid
+
+from starlette.concurrency import run_in_threadpool
+
+UPLOAD_DIR = os.getenv("EDA_UPLOAD_DIR", "uploads")
+MAX_UPLOAD_MB = float(os.getenv("EDA_MAX_UPLOAD_MB", "4096"))
+UPLOAD_CHUNK_BYTES = int(os.getenv("EDA_UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+ALLOWED_EXTENSIONS = (".csv",)
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+class StoredUpload:
+    def __init__(self, file_path: str, digest: str, size: int, deduplicated: bool):
+        self.file_path = file_path
+        self.digest = digest
+        self.size = size
+        self.deduplicated = deduplicated
+
+    def to_dict(self) -> dict:
+        return {
+            "file_path": self.file_path,
+            "digest": self.digest,
+            "size": self.size,
+            "deduplicated": self.deduplicated,
+        }
+
+
+def _write_block(f, hasher, block: bytes):
+    hasher.update(block)
+    f.write(block)
+
+
+async def store_upload(
+    chunks,
+    extension: str = ".csv",
+    upload_dir: str = UPLOAD_DIR,
+    max_bytes: int = int(MAX_UPLOAD_MB * 1024 * 1024),
+    chunk_bytes: int = UPLOAD_CHUNK_BYTES,
+) -> StoredUpload:
+    """Write an async stream of body chunks to `upload_dir` in fixed-size blocks.
+
+    At most one block is held in memory. The content is hashed on the way
+    (blake2b-160, the same digest DatasetCache keys on) and stored as
+    <digest><extension>, so uploading the same file twice keeps one copy.
+    Raises UploadTooLargeError as soon as more than max_bytes arrive.
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    tmp = os.path.join(upload_dir, f".upload-{uuid.uuid4().hex}.part")
+    hasher = hashlib.blake2b(digest_size=20)
+    buffer = bytearray()
+    size = 0
+    try:
+        with open(tmp, "wb") as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds the {max_bytes} byte limit")
+                buffer += chunk
+                while len(buffer) >= chunk_bytes:
+                    # Disk writes and hashing run off the event loop.
+                    await run_in_threadpool(_write_block, f, hasher, bytes(buffer[:chunk_bytes]))
+                    del buffer[:chunk_bytes]
+            if buffer:
+                await run_in_threadpool(_write_block, f, hasher, bytes(buffer))
+        digest = hasher.hexdigest()
+        path = os.path.join(upload_dir, digest + extension)
+        deduplicated = os.path.exists(path)
+        if deduplicated:
+            os.remove(tmp)
+        else:
+            os.replace(tmp, path)
+        return StoredUpload(path, digest, size, deduplicated)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise